@@ -0,0 +1,104 @@
+import argparse
+import os
+import sys
+import traceback
+
+EXIT_PASSED = 0
+EXIT_FAILED = 1  # 存在比对失败的用例
+EXIT_ERROR = 2  # 没有用例，或存在跳过、异常的用例
+
+
+def buildParser(description="MyLance无界面批量回放，按软件/模块/用例目录查找录制数据"):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--record-dir", default=None, help="录制数据目录，默认~/测试数据/录制数据")
+    parser.add_argument("--playback-dir", default=None, help="回放数据目录，默认~/测试数据/回放数据")
+    parser.add_argument("--software", default=None, help="只运行该软件名称下的用例，支持通配符")
+    parser.add_argument("--module", default=None, help="只运行该模块名称下的用例，支持通配符")
+    parser.add_argument("--case", default=None, help="只运行该用例编号，支持通配符")
+    parser.add_argument("--display", default=None, help="X显示编号，如:99，默认使用DISPLAY环境变量")
+    parser.add_argument("--capture", default=None, choices=["mss", "pyautogui"], help="截图后端")
+    parser.add_argument("--input", default=None, choices=["xtest", "pyautogui", "stub"], help="输入注入后端")
+    parser.add_argument("--save", default="always", choices=["always", "failed"], help="回放截图保存策略")
+    parser.add_argument("--compression", type=int, default=1, choices=range(10), metavar="0-9",
+                        help="截图PNG压缩级别，越大文件越小、写入越慢")
+    parser.add_argument("--screenshot", action="store_true", help="执行录制截图而不是回放")
+    parser.add_argument("--speed", type=float, default=1.0, help="回放时操作之间空闲时间的缩放倍数，如2表示两倍速")
+    parser.add_argument("--max-idle", type=float, default=None, help="回放时操作之间空闲时间的上限（秒）")
+    parser.add_argument("--wait-target", action="store_true", help="回放时按下鼠标前等待录制截图时的点击目标出现")
+    parser.add_argument("--target-timeout", type=float, default=10.0, help="等待点击目标的最长时间（秒）")
+    return parser
+
+
+def exitCode(failed, skipped, errors):
+    if failed:
+        return EXIT_FAILED
+    if skipped or errors:
+        return EXIT_ERROR
+    return EXIT_PASSED
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    if args.display:
+        os.environ["DISPLAY"] = args.display
+    # pyautogui在导入时连接DISPLAY，需在设置环境变量之后导入
+    from case_catalog import CCaseCatalog
+    from case_runner import EXPECT_IMAGE_DIR, PLAYBACK_DIR, RECORD_DIR, CCaseRunner, discoverCases
+    from input_backend import createInputBackend
+    from playback_scheduler import latenessMessage
+    from screen_capture import createCaptureBackend
+    from screenshot_store import STORE_DIR, CScreenshotStore
+    from target_wait import timeoutMessage
+
+    record_dir = args.record_dir or RECORD_DIR
+    playback_dir = args.playback_dir or PLAYBACK_DIR
+    cases = discoverCases(record_dir, args.software, args.module, args.case)
+    if not cases:
+        print("未找到录制数据：" + record_dir)
+        return EXIT_ERROR
+    store = CScreenshotStore(os.path.join(os.path.dirname(record_dir), STORE_DIR), args.compression)
+    runner = CCaseRunner(record_dir, playback_dir, createCaptureBackend(args.capture, args.display),
+                         createInputBackend(args.input, args.display), args.save, store)
+    runner.speed, runner.max_idle = args.speed, args.max_idle
+    runner.wait_target, runner.target_wait.timeout = args.wait_target, args.target_timeout
+    catalog = CCaseCatalog(os.path.dirname(record_dir), record_dir, playback_dir)
+    passed = failed = skipped = errors = 0
+    for index, case_dir in enumerate(cases):
+        name = os.path.relpath(case_dir, record_dir)
+        prefix = f"[{index + 1}/{len(cases)}] {name}"
+        try:
+            if args.screenshot:
+                checkpoints, report = runner.screenshot(case_dir)
+                catalog.refreshCase(case_dir)
+                if checkpoints:
+                    passed += 1
+                    print(f"{prefix} 截图{checkpoints}张，{latenessMessage(report)}")
+                else:
+                    skipped += 1
+                    print(f"{prefix} 无有效鼠标输入")
+                continue
+            if not os.path.exists(os.path.join(case_dir, EXPECT_IMAGE_DIR)):
+                skipped += 1
+                print(f"{prefix} 跳过：缺少预期截图")
+                continue
+            result = runner.playback(case_dir)
+            catalog.recordResult(case_dir, result.checkpoints, result.failed)
+        except Exception:
+            errors += 1
+            print(f"{prefix} 异常")
+            traceback.print_exc()
+            continue
+        if result.failed:
+            failed += 1
+            print(f"{prefix} 失败：{result.failed}/{result.checkpoints}步，{latenessMessage(result.report)}"
+                  f"{timeoutMessage(result.target_timeouts)}")
+        else:
+            passed += 1
+            print(f"{prefix} 通过：{result.checkpoints}步，{latenessMessage(result.report)}"
+                  f"{timeoutMessage(result.target_timeouts)}")
+    print(f"共{len(cases)}个用例：通过{passed}，失败{failed}，跳过{skipped}，异常{errors}")
+    return exitCode(failed, skipped, errors)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
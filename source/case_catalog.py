@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import threading
+
+CATALOG_FILE = "case_catalog.db"  # 位于测试数据目录下
+EXCLUDE_DIRS = ("expect_image",)
+CASE_LEVEL = 3  # 录制数据/软件/模块/用例
+CASE_RESULTS = ("未回放", "通过", "失败")  # 与主界面passed状态0/1/2对应
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    csv_path TEXT,
+    playback_csv_path TEXT,
+    steps INTEGER,
+    checkpoints INTEGER,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS nodes_parent ON nodes (parent);
+"""
+
+
+def firstCsv(path):
+    if not os.path.isdir(path):
+        return None
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".csv"):
+                return entry.path
+    return None
+
+
+def subDirs(path):
+    if not os.path.isdir(path):
+        return []
+    with os.scandir(path) as entries:
+        return [entry.path for entry in entries if entry.is_dir() and entry.name not in EXCLUDE_DIRS]
+
+
+class CCaseCatalog:
+    # 软件/模块/用例目录索引，启动和切换用例时查询索引而不是遍历目录
+    def __init__(self, test_data_dir, record_dir, playback_dir):
+        self.record_dir = record_dir
+        self.playback_dir = playback_dir
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(os.path.join(test_data_dir, CATALOG_FILE), check_same_thread=False)
+        self.connection.executescript(CATALOG_SCHEMA)
+        if self.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 0:
+            self.rebuild()
+
+    def level(self, path):
+        relative_path = os.path.relpath(path, self.record_dir)
+        if relative_path == os.curdir:
+            return 0
+        return len(relative_path.split(os.sep))
+
+    def playbackCaseDir(self, case_dir):
+        return case_dir.replace(self.record_dir, self.playback_dir)
+
+    def insertTree(self, path):
+        # 插入目录及其下全部子目录，返回新增的路径
+        rows = []
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            level = self.level(current)
+            if level == CASE_LEVEL:
+                rows.append((current, os.path.dirname(current), os.path.basename(current), level,
+                             firstCsv(current), firstCsv(self.playbackCaseDir(current))))
+            else:
+                rows.append((current, os.path.dirname(current), os.path.basename(current), level, None, None))
+                pending.extend(subDirs(current))
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO nodes (path, parent, name, level, csv_path, playback_csv_path) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return [row[0] for row in rows]
+
+    def rebuild(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM nodes")
+        for path in subDirs(self.record_dir):
+            self.insertTree(path)
+
+    def addNode(self, path):
+        self.insertTree(path)
+
+    def removeNode(self, path):
+        with self.lock, self.connection:
+            # 名称中可能含有LIKE通配符“_”，按前缀截取比较
+            prefix = path + os.sep
+            self.connection.execute("DELETE FROM nodes WHERE path = ? OR substr(path, 1, ?) = ?",
+                                    (path, len(prefix), prefix))
+
+    def refreshCase(self, case_dir):
+        # 录制、截图、回放后更新CSV路径
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE nodes SET csv_path = ?, playback_csv_path = ? WHERE path = ?",
+                (firstCsv(case_dir), firstCsv(self.playbackCaseDir(case_dir)), case_dir))
+
+    def updateCase(self, case_dir, **fields):
+        # fields为steps、checkpoints、result中的任意项
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.lock, self.connection:
+            self.connection.execute(f"UPDATE nodes SET {assignments} WHERE path = ?", (*fields.values(), case_dir))
+
+    def nodes(self):
+        # 按层级返回(路径, 上级路径, 名称, 层级)，保证上级先于下级
+        with self.lock:
+            return self.connection.execute(
+                "SELECT path, parent, name, level FROM nodes ORDER BY level, name").fetchall()
+
+    def softwareNames(self):
+        with self.lock:
+            return [row[0] for row in
+                    self.connection.execute("SELECT name FROM nodes WHERE level = 1 ORDER BY name")]
+
+    def children(self, path):
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT path FROM nodes WHERE parent = ?", (path,))]
+
+    def case(self, case_dir):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT csv_path, playback_csv_path, steps, checkpoints, result FROM nodes WHERE path = ?",
+                (case_dir,)).fetchone()
+
+    def csvPath(self, case_dir):
+        # 存在回放数据时显示回放CSV，否则显示录制CSV
+        row = self.case(case_dir)
+        if row is None:
+            return None
+        csv_path, playback_csv_path = row[0], row[1]
+        if playback_csv_path and os.path.exists(playback_csv_path):
+            return playback_csv_path
+        if csv_path and os.path.exists(csv_path):
+            return csv_path
+        self.refreshCase(case_dir)
+        row = self.case(case_dir)
+        return row[1] or row[0]
+
+    def reconcileDir(self, path):
+        # 文件监视回调：比对目录实际内容与索引，返回(新增路径, 删除路径)
+        if not os.path.isdir(path):
+            removed = [path] if self.case(path) is not None else []
+            self.removeNode(path)
+            return [], removed
+        actual = set(subDirs(path)) if self.level(path) < CASE_LEVEL else set()
+        indexed = set(self.children(path))
+        added = []
+        for child in sorted(actual - indexed):
+            added.extend(self.insertTree(child))
+        removed = sorted(indexed - actual)
+        for child in removed:
+            self.removeNode(child)
+        return added, removed
+
+    def reconcile(self):
+        # 启动时只核对软件、模块目录，补上程序未运行期间新增或删除的用例
+        pending = [self.record_dir]
+        while pending:
+            path = pending.pop()
+            self.reconcileDir(path)
+            if self.level(path) < CASE_LEVEL - 1:
+                pending.extend(self.children(path))
+
+    def recordResult(self, case_dir, checkpoints, failed):
+        # 无界面回放结束后更新回放CSV路径和结果
+        self.refreshCase(case_dir)
+        self.updateCase(case_dir, checkpoints=checkpoints, result=CASE_RESULTS[2 if failed else 1])
+
+    def close(self):
+        self.connection.close()
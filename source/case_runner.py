@@ -0,0 +1,205 @@
+import glob
+import os
+import shutil
+import threading
+import time
+from collections import namedtuple
+import pandas as pd
+from compare_region import CCompareRegion, saveRuntimeRegions
+from image_compare import COMPARE_TIER_HEADER, SAVE_ALWAYS, CComparePool, saveDiffRegions, stepResult
+from input_backend import createInputBackend
+from playback_plan import CPlaybackDispatcher, acceleratePlan, compilePlan, markSync
+from playback_scheduler import CPlaybackAborted
+from recording_analysis import recordingCheckpoints
+from recording_cache import readCaseData, readRecording
+from recording_format import BUTTON_DOWN, RECORD_HEADER, CEventType
+from screen_capture import createCaptureBackend
+from screen_settle import CScreenSettle, clickRegion
+from screenshot_store import STORE_DIR, CScreenshotStore
+from target_wait import TARGET_DIR, CTargetWait
+
+TEST_DATA_DIR = os.path.join(os.path.expanduser("~"), "测试数据")
+RECORD_DIR = os.path.join(TEST_DATA_DIR, "录制数据")
+PLAYBACK_DIR = os.path.join(TEST_DATA_DIR, "回放数据")
+EXPECT_IMAGE_DIR = "expect_image"
+RUNTIME_IMAGE_DIR = "runtime_image"
+PROGRESS_INTERVAL = 0.1  # 非截图步骤报告进度的最短间隔（秒）
+
+# 单个用例回放结果：用例目录、回放CSV路径、截图步骤数、失败步骤数、调度延迟统计、等待点击目标超时次数
+CCaseResult = namedtuple("CCaseResult", ["case_dir", "csv_path", "checkpoints", "failed", "report",
+                                         "target_timeouts"], defaults=(0,))
+
+
+def recordCsvPath(case_dir):
+    files = glob.glob(f"{case_dir}/*.csv")
+    if files:
+        return files[0]
+
+
+def discoverCases(record_dir, software=None, module=None, case=None):
+    # 录制数据目录结构：软件/模块/用例编号/用例标题.csv
+    pattern = os.path.join(record_dir, software or "*", module or "*", case or "*")
+    return sorted(case_dir for case_dir in glob.glob(pattern) if os.path.isdir(case_dir) and recordCsvPath(case_dir))
+
+
+def mergeResults(df, results):
+    # results为{行号: (相似度, 比对层级, 差异区域)}，写入相似度、结果和比对方式列
+    df[RECORD_HEADER[5]] = df[RECORD_HEADER[5]].astype(object)
+    df[COMPARE_TIER_HEADER] = pd.Series(index=df.index, dtype=object)
+    for row, (ssim_value, tier, _) in results.items():
+        df.iloc[row, 4] = round(ssim_value, 4)
+        df.iloc[row, 5] = stepResult(ssim_value)
+        df.loc[row, COMPARE_TIER_HEADER] = tier
+    return df
+
+
+class CCaseRunner:
+    def __init__(self, record_dir=RECORD_DIR, playback_dir=PLAYBACK_DIR, capture=None, input_backend=None,
+                 save_policy=SAVE_ALWAYS, store=None):
+        self.record_dir = record_dir
+        self.playback_dir = playback_dir
+        self.capture = capture or createCaptureBackend()
+        self.input = input_backend or createInputBackend()
+        self.save_policy = save_policy
+        self.store = store or CScreenshotStore(os.path.join(os.path.dirname(record_dir), STORE_DIR))
+        self.speed = 1.0  # 回放时空闲时间缩放倍数，录制截图始终按原速
+        self.max_idle = None  # 回放时空闲时间上限（秒）
+        self.wait_target = False  # 回放时按下鼠标前等待点击目标出现
+        self.target_timeouts = 0
+        self.abort = threading.Event()  # 置位后中止录制截图或回放并抛出CPlaybackAborted，由调用方在开始前清除
+        self.screen_settle = CScreenSettle(self.capture.grab, abort=self.abort)
+        self.target_wait = CTargetWait(self.capture.grab, abort=self.abort)
+        self.compare_pool = None
+        self.compare_region = None
+        self.runtime_regions = {}
+        self.on_progress = None  # 进度回调，参数为(已执行步骤数, 总步骤数, 通过数, 失败数)
+        self.progress_total = 0
+        self.progress_time = 0.0
+
+    def playbackCaseDir(self, case_dir):
+        return case_dir.replace(self.record_dir, self.playback_dir)
+
+    def resetImageDir(self, image_dir):
+        self.store.release(image_dir)
+        os.makedirs(image_dir)
+
+    def releaseCase(self, case_dir):
+        # 删除用例前释放录制和回放截图的引用
+        self.store.release(os.path.join(case_dir, EXPECT_IMAGE_DIR))
+        self.store.release(os.path.join(self.playbackCaseDir(case_dir), RUNTIME_IMAGE_DIR))
+
+    def stepProgress(self, index, step):
+        # 截图步骤和最后一步立即报告，其余步骤限制报告频率
+        now = time.perf_counter()
+        if step.checkpoint or index == self.progress_total - 1 or now - self.progress_time >= PROGRESS_INTERVAL:
+            self.progress_time = now
+            self.reportProgress(index + 1)
+
+    def reportProgress(self, current):
+        if self.on_progress is not None:
+            self.on_progress(current, self.progress_total, self.compare_pool.passed, self.compare_pool.failed)
+
+    def dispatcher(self, plan, on_checkpoint, on_sync):
+        # 未设置进度回调时不在每步增加额外调用
+        self.progress_total = len(plan)
+        self.progress_time = 0.0
+        return CPlaybackDispatcher(self.input, on_checkpoint, on_sync,
+                                   self.stepProgress if self.on_progress else None, self.abort)
+
+    def closePool(self):
+        if self.compare_pool is not None:
+            self.compare_pool.shutdown()
+            self.compare_pool = None
+            self.store.flush()
+
+    def screenshotCheckpoint(self, step, expect_image_dir):
+        self.screen_settle.wait(clickRegion(step.x, step.y, self.capture.size()))
+        self.compare_pool.submitSave(
+            step.row, self.capture.grab(), os.path.join(expect_image_dir, str(step.row + 1) + ".png"))
+
+    def screenshotTarget(self, step, expect_image_dir):
+        self.target_wait.capture(step.row + 1, step.x, step.y, self.capture.size(),
+                                 os.path.join(expect_image_dir, TARGET_DIR))
+
+    def screenshot(self, case_dir):
+        # 录制截图，返回(截图步骤数, 调度延迟统计)；没有截图步骤时删除expect_image目录
+        playback_case_dir = self.playbackCaseDir(case_dir)
+        self.store.release(os.path.join(playback_case_dir, RUNTIME_IMAGE_DIR))
+        if os.path.exists(playback_case_dir):
+            shutil.rmtree(playback_case_dir)
+        expect_image_dir = os.path.join(case_dir, EXPECT_IMAGE_DIR)
+        self.resetImageDir(expect_image_dir)
+        recording = readRecording(recordCsvPath(case_dir))
+        plan = compilePlan(recording, recordingCheckpoints(recording))
+        # 每次按下鼠标前保存点击位置的模板，供回放时等待目标
+        plan = markSync(plan, [step.row for step in plan.steps if step.event in BUTTON_DOWN])
+        self.compare_pool = CComparePool(store=self.store)
+        try:
+            report = self.dispatcher(
+                plan, lambda step: self.screenshotCheckpoint(step, expect_image_dir),
+                lambda step: self.screenshotTarget(step, expect_image_dir)).run(plan)
+            self.compare_pool.results()
+        except CPlaybackAborted:
+            # 中止的录制截图不完整，删除后需重新录制截图
+            self.closePool()
+            self.store.release(expect_image_dir)
+            raise
+        finally:
+            self.closePool()
+        checkpoints = len(plan.checkpointRows())
+        if not checkpoints:
+            self.store.release(expect_image_dir)
+        return checkpoints, report
+
+    def syncStep(self, step):
+        # 有点击目标模板时等待目标出现，否则（空闲时间被压缩后）等待画面稳定再执行点击或按键
+        if step.row + 1 in self.target_wait.templates:
+            if not self.target_wait.wait(step.row + 1, step.x, step.y, self.capture.size()):
+                self.target_timeouts += 1
+        elif step.event >= CEventType.KEY_DOWN:
+            self.screen_settle.wait()
+        else:
+            self.screen_settle.wait(clickRegion(step.x, step.y, self.capture.size()))
+
+    def playbackCheckpoint(self, step, case_dir, runtime_image_dir):
+        self.screen_settle.wait(clickRegion(step.x, step.y, self.capture.size()))
+        region = self.compare_region.region(step.row + 1)
+        self.runtime_regions[step.row + 1] = region
+        self.compare_pool.submit(
+            step.row, self.capture.grab(region),
+            os.path.join(runtime_image_dir, str(step.row + 1) + ".png"),
+            os.path.join(case_dir, EXPECT_IMAGE_DIR, str(step.row + 1) + ".png"),
+            region, self.compare_region.ignores(step.row + 1))
+
+    def playback(self, case_dir):
+        # 回放并比对，结果写入回放数据目录下同名CSV
+        playback_case_dir = self.playbackCaseDir(case_dir)
+        runtime_image_dir = os.path.join(playback_case_dir, RUNTIME_IMAGE_DIR)
+        self.resetImageDir(runtime_image_dir)
+        csv_path = recordCsvPath(case_dir)
+        df = readCaseData(csv_path).df.copy()
+        recording = readRecording(csv_path)
+        plan = acceleratePlan(compilePlan(recording, recordingCheckpoints(recording)), self.speed, self.max_idle)
+        self.target_timeouts = 0
+        self.target_wait.templates = {}
+        if self.wait_target:
+            templates = self.target_wait.load(os.path.join(case_dir, EXPECT_IMAGE_DIR, TARGET_DIR))
+            plan = markSync(plan, [step_name - 1 for step_name in templates])
+        self.compare_pool = CComparePool(save_policy=self.save_policy, store=self.store)
+        self.compare_region = CCompareRegion(case_dir)
+        self.runtime_regions = {}
+        try:
+            report = self.dispatcher(
+                plan, lambda step: self.playbackCheckpoint(step, case_dir, runtime_image_dir), self.syncStep).run(plan)
+            results = self.compare_pool.results()
+            self.reportProgress(len(plan))
+        finally:
+            self.closePool()
+        saveRuntimeRegions(runtime_image_dir, self.runtime_regions)
+        saveDiffRegions(runtime_image_dir, {row + 1: boxes for row, (_, _, boxes) in results.items()
+                                            if boxes is not None})
+        mergeResults(df, results)
+        playback_csv_path = os.path.join(playback_case_dir, os.path.basename(csv_path))
+        df.to_csv(playback_csv_path, index=False, encoding='utf-8')
+        failed = sum(1 for ssim_value, _, _ in results.values() if stepResult(ssim_value) == "失败")
+        return CCaseResult(case_dir, playback_csv_path, len(results), failed, report, self.target_timeouts)
@@ -0,0 +1,115 @@
+import traceback
+from PyQt5.QtCore import QThread, pyqtSignal
+from playback_scheduler import CPlaybackAborted
+
+ABORT_HOTKEY = "<ctrl>+<shift>+q"  # 录制截图、回放期间的全局中止快捷键（pynput格式）
+ABORT_HOTKEY_TEXT = "Ctrl+Shift+Q"
+RECORD_PROGRESS_INTERVAL = 200  # 录制时刷新事件数的间隔（毫秒）
+
+
+class CRecordWorker(QThread):
+    # 后台线程监听键鼠并录制，按ESC结束
+    progress = pyqtSignal(int)  # 已录制事件数
+
+    def __init__(self, csv_path, parent=None):
+        super(CRecordWorker, self).__init__(parent)
+        self.csv_path = csv_path
+        self.record_session = None
+        self.mouse_listener = None
+        self.keyboard_listener = None
+        self.error = None
+
+    @staticmethod
+    def keyJudge(key):
+        try:
+            return key.char
+        except AttributeError:
+            parts = str(key).split(".")
+            return parts[1]
+
+    def onMouseMove(self, x, y):
+        self.record_session.pushMove(x, y)
+
+    def onMouseClick(self, x, y, button, pressed):
+        from pynput import mouse
+        if button != mouse.Button.left and button != mouse.Button.right and button != mouse.Button.middle:
+            return
+        if pressed:
+            self.record_session.push("Mouse", "mouse " + button.name + " down", [x, y])
+        else:
+            self.record_session.push("Mouse", "mouse " + button.name + " up", [x, y])
+
+    def onMouseWheel(self, x, y, dx, dy):
+        if dy > 0:
+            self.record_session.push("Mouse", "mouse wheel up", [x, y])
+        else:
+            self.record_session.push("Mouse", "mouse wheel down", [x, y])
+
+    def onKeyboardDown(self, key):
+        from pynput import keyboard
+        if key == keyboard.Key.esc:
+            self.stop()
+            return
+        self.record_session.push("Keyboard", "key down", self.keyJudge(key))
+
+    def onKeyboardUp(self, key):
+        self.record_session.push("Keyboard", "key up", self.keyJudge(key))
+
+    def stop(self):
+        self.mouse_listener.stop()
+        self.keyboard_listener.stop()
+        self.record_session.flush_event.set()
+
+    def run(self):
+        try:
+            from pynput import mouse, keyboard
+            from record_session import CRecordSession
+            self.record_session = CRecordSession(self.csv_path)
+            self.mouse_listener = mouse.Listener(
+                on_move=self.onMouseMove, on_click=self.onMouseClick, on_scroll=self.onMouseWheel)
+            self.keyboard_listener = keyboard.Listener(on_press=self.onKeyboardDown, on_release=self.onKeyboardUp)
+            self.record_session.start()
+            self.mouse_listener.start()
+            self.keyboard_listener.start()
+            while self.keyboard_listener.is_alive():
+                self.keyboard_listener.join(RECORD_PROGRESS_INTERVAL / 1000)
+                self.progress.emit(len(self.record_session.history))
+            self.mouse_listener.join()
+            self.record_session.stop()
+        except Exception:
+            self.error = traceback.format_exc()
+
+
+class CPlaybackWorker(QThread):
+    # 后台线程执行录制截图或回放，界面线程只接收进度和结果；执行期间监听全局中止快捷键
+    progress = pyqtSignal(int, int, int, int)  # 已执行步骤数、总步骤数、通过数、失败数
+
+    def __init__(self, case_runner, task, case_dir, parent=None):
+        super(CPlaybackWorker, self).__init__(parent)
+        self.case_runner = case_runner
+        self.task = task  # case_runner.screenshot或case_runner.playback
+        self.case_dir = case_dir
+        self.result = None
+        self.aborted = False
+        self.error = None
+
+    def abort(self):
+        self.case_runner.abort.set()
+
+    def run(self):
+        hotkey = None
+        self.case_runner.abort.clear()
+        self.case_runner.on_progress = self.progress.emit
+        try:
+            from pynput import keyboard
+            hotkey = keyboard.GlobalHotKeys({ABORT_HOTKEY: self.abort})
+            hotkey.start()
+            self.result = self.task(self.case_dir)
+        except CPlaybackAborted:
+            self.aborted = True
+        except Exception:
+            self.error = traceback.format_exc()
+        finally:
+            self.case_runner.on_progress = None
+            if hotkey is not None:
+                hotkey.stop()
@@ -0,0 +1,79 @@
+import json
+import os
+
+REGION_FILE = "compare_region.json"  # 用例目录下，与expect_image同级
+RUNTIME_REGION_FILE = "regions.json"  # runtime_image目录下，记录回放时实际截取的区域
+MIN_REGION_SIZE = 7  # 比对区域宽高的下限（像素），与SSIM默认窗口一致
+
+
+class CCompareRegion:
+    # 区域均为屏幕坐标[x, y, width, height]；步骤配置覆盖用例的比对区域，忽略区域两者叠加
+    def __init__(self, case_dir):
+        self.path = os.path.join(case_dir, REGION_FILE)
+        self.case = {"region": None, "ignore": []}
+        self.steps = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.case = data.get("case", self.case)
+            self.steps = data.get("steps", {})
+
+    def config(self, step_name=None):
+        if step_name is None:
+            return self.case
+        return self.steps.setdefault(str(step_name), {"region": None, "ignore": []})
+
+    def region(self, step_name):
+        step_config = self.steps.get(str(step_name), {})
+        return step_config.get("region") or self.case.get("region")
+
+    def ignores(self, step_name):
+        return self.case.get("ignore", []) + self.steps.get(str(step_name), {}).get("ignore", [])
+
+    def setRegion(self, rect, step_name=None):
+        self.config(step_name)["region"] = rect
+
+    def addIgnore(self, rect, step_name=None):
+        self.config(step_name)["ignore"].append(rect)
+
+    def clear(self, step_name=None):
+        if step_name is None:
+            self.case = {"region": None, "ignore": []}
+        else:
+            self.steps.pop(str(step_name), None)
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"case": self.case, "steps": self.steps}, f, ensure_ascii=False)
+
+
+def cropRegion(image, region):
+    if not region:
+        return image
+    x, y, width, height = region
+    return image[y:y + height, x:x + width]
+
+
+def maskIgnores(image, ignores, origin=(0, 0)):
+    # 忽略区域在两张图上置零，origin为image左上角的屏幕坐标
+    if not ignores:
+        return image
+    image = image.copy()
+    for x, y, width, height in ignores:
+        left = max(x - origin[0], 0)
+        top = max(y - origin[1], 0)
+        image[top:max(y - origin[1] + height, 0), left:max(x - origin[0] + width, 0)] = 0
+    return image
+
+
+def saveRuntimeRegions(runtime_image_dir, regions):
+    with open(os.path.join(runtime_image_dir, RUNTIME_REGION_FILE), 'w', encoding='utf-8') as f:
+        json.dump(regions, f)
+
+
+def loadRuntimeRegions(runtime_image_dir):
+    path = os.path.join(runtime_image_dir, RUNTIME_REGION_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
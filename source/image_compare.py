@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from skimage.metrics import structural_similarity as compare_ssim
+from compare_region import MIN_REGION_SIZE, cropRegion, maskIgnores
+
+SSIM_THRESHOLD = 0.985  # 相似度高于该值判定通过
+COARSE_SCALE = 0.25  # 缩略比对的缩放比例
+# 缩略图相似度低于该值直接判定失败；缩小会平滑噪声、抬高相似度，缩略图高分不能推出全分辨率通过，因此只用于提前判定失败
+COARSE_FAIL_THRESHOLD = 0.9
+
+# 回放截图保存策略：全部保存或仅保存失败步骤
+SAVE_ALWAYS = "always"
+SAVE_FAILED = "failed"
+
+# 每步记录所用的比对层级
+COMPARE_TIER_HEADER = "比对方式"
+TIER_EXACT = "像素一致"
+TIER_SIZE = "尺寸不同"
+TIER_PIXEL = "逐像素比对"  # 图像宽或高小于SSIM窗口时只比较像素是否一致
+TIER_COARSE = "缩略比对"
+TIER_FULL = "完整比对"
+
+# 失败步骤的差异标注，比对时计算一次，查看图片时直接读取
+DIFF_DIR = "diff"  # runtime_image目录下，N.png为带透明通道的差异热力图
+DIFF_FILE = "diff.json"  # runtime_image目录下，记录各失败步骤的差异区域
+DIFF_SSIM_THRESHOLD = 0.8  # 局部相似度低于该值的像素视为有差异
+DIFF_MIN_AREA = 16  # 面积小于该值（像素）的差异区域视为噪点忽略
+
+
+def readImage(path):
+    return cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def writeImage(path, image):
+    # cv2.imwrite不支持中文路径，先编码再写文件
+    cv2.imencode(".png", image)[1].tofile(path)
+
+
+def toGray(image):
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def compareImages(runtime_image, expect_image):
+    # 分层比对：像素完全一致直接通过，缩略图明显不同时直接判定失败，其余计算全分辨率SSIM
+    # 返回(相似度, 比对层级, 局部相似度图)，缩略比对的局部相似度图为缩略图尺寸
+    if runtime_image.shape != expect_image.shape:
+        return 0.0, TIER_SIZE, None
+    if np.array_equal(runtime_image, expect_image):
+        return 1.0, TIER_EXACT, None
+    runtime_gray = toGray(runtime_image)
+    expect_gray = toGray(expect_image)
+    height, width = runtime_gray.shape
+    if min(height, width) < MIN_REGION_SIZE:
+        # 小于SSIM窗口无法计算相似度，像素不完全一致即判定失败，不一致的像素即差异
+        return 0.0, TIER_PIXEL, (runtime_gray == expect_gray).astype(np.float64)
+    coarse_size = (max(7, int(width * COARSE_SCALE)), max(7, int(height * COARSE_SCALE)))
+    coarse_value, coarse_map = compare_ssim(cv2.resize(runtime_gray, coarse_size, interpolation=cv2.INTER_AREA),
+                                            cv2.resize(expect_gray, coarse_size, interpolation=cv2.INTER_AREA),
+                                            full=True)
+    if coarse_value < COARSE_FAIL_THRESHOLD:
+        return float(coarse_value), TIER_COARSE, coarse_map
+    # full=True只是多返回计算过程中已有的局部相似度图，不增加计算量
+    ssim_value, ssim_map = compare_ssim(runtime_gray, expect_gray, full=True)
+    return float(ssim_value), TIER_FULL, ssim_map
+
+
+def diffRegions(ssim_map, origin=(0, 0)):
+    # 由局部相似度图生成差异热力图（BGRA，无差异处透明）和差异区域列表（屏幕坐标[x, y, width, height]）
+    dissimilarity = np.clip(1.0 - ssim_map, 0.0, 1.0)
+    mask = (ssim_map < DIFF_SSIM_THRESHOLD).astype(np.uint8)
+    heatmap = cv2.cvtColor(cv2.applyColorMap((dissimilarity * 255).astype(np.uint8), cv2.COLORMAP_JET),
+                           cv2.COLOR_BGR2BGRA)
+    heatmap[:, :, 3] = mask * (96 + dissimilarity * 159).astype(np.uint8)
+    # 闭运算合并相邻的细碎差异，避免一处文字变化产生大量小框
+    merged = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((7, 7), np.uint8))
+    count, _, stats, _ = cv2.connectedComponentsWithStats(merged, connectivity=8)
+    boxes = [[int(x + origin[0]), int(y + origin[1]), int(width), int(height)]
+             for x, y, width, height, area in stats[1:count] if area >= DIFF_MIN_AREA]
+    return heatmap, boxes
+
+
+def saveDiffRegions(runtime_image_dir, diff_regions):
+    with open(os.path.join(runtime_image_dir, DIFF_FILE), 'w', encoding='utf-8') as f:
+        json.dump(diff_regions, f)
+
+
+def loadDiffRegions(runtime_image_dir):
+    path = os.path.join(runtime_image_dir, DIFF_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def stepResult(ssim_value):
+    return "通过" if ssim_value > SSIM_THRESHOLD else "失败"
+
+
+class CComparePool:
+    # OpenCV和SSIM计算期间释放GIL，线程池即可并行且无需跨进程拷贝整屏图像
+    def __init__(self, max_workers=None, save_policy=SAVE_ALWAYS, store=None):
+        if max_workers is None:
+            max_workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.save_policy = save_policy
+        self.store = store  # CScreenshotStore，为None时直接写PNG文件
+        self.futures = {}
+        self.lock = threading.Lock()
+        self.passed = 0  # 已完成比对的通过、失败步骤数，用于回放进度显示
+        self.failed = 0
+
+    def saveImage(self, path, frame):
+        if self.store is None:
+            writeImage(path, frame)
+        else:
+            self.store.put(path, frame)
+
+    def compareTask(self, frame, runtime_image_path, expect_image_path, region=None, ignores=None):
+        # frame为截图得到的BGR数组（设置比对区域时仅为区域内图像），比对与保存都在后台完成
+        expect_image = cropRegion(readImage(expect_image_path), region)
+        # 返回(相似度, 比对层级, 差异区域)，通过的步骤差异区域为None
+        origin = region[:2] if region else (0, 0)
+        runtime_masked = maskIgnores(frame, ignores, origin)
+        expect_masked = maskIgnores(expect_image, ignores, origin)
+        ssim_value, tier, ssim_map = compareImages(runtime_masked, expect_masked)
+        if ssim_value > SSIM_THRESHOLD:
+            if self.save_policy == SAVE_ALWAYS:
+                self.saveImage(runtime_image_path, frame)
+            return ssim_value, tier, None
+        self.saveImage(runtime_image_path, frame)
+        return ssim_value, tier, self.saveDiff(runtime_image_path, runtime_masked, expect_masked, ssim_map, origin)
+
+    @staticmethod
+    def saveDiff(runtime_image_path, runtime_image, expect_image, ssim_map, origin):
+        # 尺寸不同无法逐像素比较，整张截图视为差异区域
+        if runtime_image.shape != expect_image.shape:
+            return [[int(origin[0]), int(origin[1]), runtime_image.shape[1], runtime_image.shape[0]]]
+        height, width = runtime_image.shape[:2]
+        if ssim_map.shape != (height, width):
+            # 缩略比对判定失败的步骤直接放大缩略图的局部相似度，不再计算全分辨率SSIM
+            ssim_map = cv2.resize(ssim_map, (width, height), interpolation=cv2.INTER_LINEAR)
+        heatmap, boxes = diffRegions(ssim_map, origin)
+        diff_dir = os.path.join(os.path.dirname(runtime_image_path), DIFF_DIR)
+        os.makedirs(diff_dir, exist_ok=True)
+        writeImage(os.path.join(diff_dir, os.path.basename(runtime_image_path)), heatmap)
+        return boxes
+
+    def submit(self, row, frame, runtime_image_path, expect_image_path, region=None, ignores=None):
+        self.futures[row] = self.executor.submit(
+            self.compareTask, frame, runtime_image_path, expect_image_path, region, ignores)
+        self.futures[row].add_done_callback(self.countResult)
+
+    def countResult(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self.lock:
+            if future.result()[0] > SSIM_THRESHOLD:
+                self.passed += 1
+            else:
+                self.failed += 1
+
+    def submitSave(self, row, frame, image_path):
+        self.futures[row] = self.executor.submit(self.saveImage, image_path, frame)
+
+    def results(self):
+        # 等待全部任务结束，返回{行号: 任务结果}
+        results = {row: future.result() for row, future in sorted(self.futures.items())}
+        self.futures.clear()
+        return results
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,158 @@
+import sys
+
+try:
+    from Xlib import X, XK
+    from Xlib.display import Display
+    from Xlib.ext import xtest
+except ImportError:
+    Display = None
+
+# pynput录制的特殊按键名与pyautogui按键名不一致的部分
+PYAUTOGUI_KEYS = {
+    "alt_l": "altleft", "alt_r": "altright", "alt_gr": "altright", "caps_lock": "capslock",
+    "cmd": "winleft", "cmd_l": "winleft", "cmd_r": "winright", "ctrl_l": "ctrlleft", "ctrl_r": "ctrlright",
+    "shift_l": "shiftleft", "shift_r": "shiftright", "page_down": "pagedown", "page_up": "pageup",
+    "print_screen": "printscreen", "scroll_lock": "scrolllock", "num_lock": "numlock", "menu": "apps",
+}
+
+# pynput录制的特殊按键名对应的X11 keysym名称
+X11_KEYSYMS = {
+    "alt": "Alt_L", "alt_l": "Alt_L", "alt_r": "Alt_R", "alt_gr": "ISO_Level3_Shift", "backspace": "BackSpace",
+    "caps_lock": "Caps_Lock", "cmd": "Super_L", "cmd_l": "Super_L", "cmd_r": "Super_R", "ctrl": "Control_L",
+    "ctrl_l": "Control_L", "ctrl_r": "Control_R", "delete": "Delete", "down": "Down", "end": "End",
+    "enter": "Return", "esc": "Escape", "home": "Home", "insert": "Insert", "left": "Left", "menu": "Menu",
+    "num_lock": "Num_Lock", "page_down": "Next", "page_up": "Prior", "pause": "Pause", "print_screen": "Print",
+    "right": "Right", "scroll_lock": "Scroll_Lock", "shift": "Shift_L", "shift_l": "Shift_L",
+    "shift_r": "Shift_R", "space": "space", "tab": "Tab", "up": "Up",
+}
+
+
+class CPyautoguiInput:
+    name = "pyautogui"
+
+    def __init__(self, display=None):
+        # pyautogui和pynput导入时即连接显示，只在使用该后端时导入，stub后端无显示也可使用
+        import pyautogui
+        from pynput.mouse import Controller
+        self.display = display
+        self.pyautogui = pyautogui
+        # 回放节奏由调度器控制，关闭pyautogui每次调用后的默认停顿
+        pyautogui.PAUSE = 0
+        pyautogui.FAILSAFE = False
+        self.mouse_controller = Controller()
+
+    def move(self, x, y):
+        self.pyautogui.moveTo(x, y)
+
+    def buttonDown(self, button):
+        self.pyautogui.mouseDown(button=button)
+
+    def buttonUp(self, button):
+        self.pyautogui.mouseUp(button=button)
+
+    def scroll(self, dy):
+        # pyautogui在Windows下滚动单位不是一格，沿用pynput
+        self.mouse_controller.scroll(0, dy)
+
+    def keyDown(self, key):
+        if key:
+            self.pyautogui.keyDown(PYAUTOGUI_KEYS.get(key, key))
+
+    def keyUp(self, key):
+        if key:
+            self.pyautogui.keyUp(PYAUTOGUI_KEYS.get(key, key))
+
+
+class CXTestInput:
+    # 通过XTest扩展直接向X服务器注入事件，无隐式停顿，可指定Xvfb的DISPLAY
+    name = "xtest"
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+    def __init__(self, display=None):
+        self.display = Display(display)
+        self.keycodes = {}
+
+    def keycode(self, key):
+        if not key:
+            return 0  # 录制时未取到名称的按键
+        if key not in self.keycodes:
+            if key in X11_KEYSYMS:
+                keysym = XK.string_to_keysym(X11_KEYSYMS[key])
+            elif len(key) == 1:
+                keysym = XK.string_to_keysym(key) or ord(key)
+            elif key.startswith("f") and key[1:].isdigit():
+                keysym = XK.string_to_keysym(key.upper())
+            else:
+                keysym = XK.string_to_keysym(key)
+            self.keycodes[key] = self.display.keysym_to_keycode(keysym) if keysym else 0
+        return self.keycodes[key]
+
+    def move(self, x, y):
+        xtest.fake_input(self.display, X.MotionNotify, x=x, y=y)
+        self.display.flush()
+
+    def buttonDown(self, button):
+        xtest.fake_input(self.display, X.ButtonPress, self.BUTTONS[button])
+        self.display.flush()
+
+    def buttonUp(self, button):
+        xtest.fake_input(self.display, X.ButtonRelease, self.BUTTONS[button])
+        self.display.flush()
+
+    def scroll(self, dy):
+        button = 4 if dy > 0 else 5
+        for _ in range(abs(dy)):
+            xtest.fake_input(self.display, X.ButtonPress, button)
+            xtest.fake_input(self.display, X.ButtonRelease, button)
+        self.display.flush()
+
+    def keyDown(self, key):
+        keycode = self.keycode(key)
+        if keycode:
+            xtest.fake_input(self.display, X.KeyPress, keycode)
+            self.display.flush()
+
+    def keyUp(self, key):
+        keycode = self.keycode(key)
+        if keycode:
+            xtest.fake_input(self.display, X.KeyRelease, keycode)
+            self.display.flush()
+
+
+class CStubInput:
+    # 不注入任何事件，仅用于空跑统计回放耗时与调度延迟
+    name = "stub"
+
+    def __init__(self, display=None):
+        self.display = display
+        self.count = 0
+
+    def move(self, x, y):
+        self.count += 1
+
+    def buttonDown(self, button):
+        self.count += 1
+
+    def buttonUp(self, button):
+        self.count += 1
+
+    def scroll(self, dy):
+        self.count += 1
+
+    def keyDown(self, key):
+        self.count += 1
+
+    def keyUp(self, key):
+        self.count += 1
+
+
+INPUT_BACKENDS = {CPyautoguiInput.name: CPyautoguiInput, CXTestInput.name: CXTestInput, CStubInput.name: CStubInput}
+
+
+def createInputBackend(name=None, display=None):
+    # 未指定时Linux下优先使用XTest，其他平台或未安装python-xlib时使用pyautogui
+    if name is None:
+        name = CXTestInput.name if Display is not None and sys.platform.startswith("linux") else CPyautoguiInput.name
+    if name == CXTestInput.name and Display is None:
+        raise RuntimeError("输入后端xtest需要python-xlib，请执行pip install python-xlib")
+    return INPUT_BACKENDS[name](display)
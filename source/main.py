@@ -1,9 +1,26 @@
+import time
+START_TIME = time.perf_counter()  # 在导入Qt之前计时，启动用时包含导入界面模块
+
+import argparse
+import sys
 from PyQt5.QtWidgets import QApplication
 from mainwindow import CMainWindow
 
+STARTUP_TARGET = 0.5  # 从启动到显示主界面的目标用时（秒），不含Python解释器自身启动
+
 
 if __name__ == '__main__':
-    app = QApplication([])
+    parser = argparse.ArgumentParser(description="录制回放测试工具")
+    parser.add_argument("--startup-time", action="store_true", help="显示主界面后输出启动用时并退出")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
     w = CMainWindow()
     w.main_window.show()
+    app.processEvents()
+    startup_time = time.perf_counter() - START_TIME
+    if args.startup_time:
+        print(f"启动用时：{startup_time:.3f}秒，目标：{STARTUP_TARGET}秒")
+        sys.exit(0 if startup_time <= STARTUP_TARGET else 1)
+    if startup_time > STARTUP_TARGET:
+        print(f"启动用时{startup_time:.3f}秒，超过目标{STARTUP_TARGET}秒", file=sys.stderr)
     app.exec_()
@@ -1,37 +1,46 @@
-import csv
-import glob
+import bisect
 import os
 import shutil
-import time
-import cv2
-import numpy as np
-import pandas as pd
-import pyautogui
-import markdown
-from PyQt5 import uic
-from PyQt5.QtCore import QRegExp, Qt
-from PyQt5.QtGui import QRegExpValidator, QColor, QPixmap, QIcon
-from PyQt5.QtWidgets import QMessageBox, QHeaderView, QTreeWidgetItem, QTableWidgetItem, QGraphicsScene, QHBoxLayout
-from pynput import mouse, keyboard
-from pynput.mouse import Controller
-from skimage.metrics import structural_similarity as compare_ssim
-from zoom_graphics_view import CZoomGraphicsView
+from PyQt5.QtCore import QFileSystemWatcher, QRegExp, QRectF, Qt
+from PyQt5.QtGui import QRegExpValidator, QColor, QIcon, QPen, QBrush
+from PyQt5.QtWidgets import QMessageBox, QHeaderView, QTreeWidgetItem, QGraphicsScene, QHBoxLayout, QProgressBar
+from case_catalog import CASE_LEVEL, CASE_RESULTS, CCaseCatalog
+from case_worker import ABORT_HOTKEY_TEXT, CPlaybackWorker, CRecordWorker
+from compare_region import MIN_REGION_SIZE, RUNTIME_REGION_FILE, CCompareRegion, loadRuntimeRegions
+from pixmap_cache import CPixmapCache
+from playback_scheduler import PLAYBACK_SPEEDS, latenessMessage
+from recording_table_model import CRecordingTableModel
+from ui_forms import loadForm, resourcePath
+from zoom_graphics_view import CPyramidPixmapItem, CZoomGraphicsView
+
+# 图像处理（OpenCV、skimage）、录制数据（pandas、numpy）和键鼠（pynput、pyautogui）相关模块
+# 在首次录制、回放、比对时才导入，主界面启动只需要Qt和用例索引
 
 
 class CMainWindow:
     def __init__(self):
-        # 从文件中加载UI定义
-        self.main_window = uic.loadUi("mainwindow.ui")
-        self.instruction = uic.loadUi("instruction.ui")
-        self.image_comparison = uic.loadUi("image.ui")
+        # 加载预编译的UI定义
+        self.main_window = loadForm("mainwindow")
+        self.instruction = loadForm("instruction")
+        self.image_comparison = loadForm("image")
 
         # 初始化
         self.passed = 0  # 0未回放，1通过，2失败
-        pyautogui.FAILSAFE = False
+        self.case_runner = None
+        self.case_catalog = None
+        self.catalog_watcher = None
+        self.tree_items = {}  # 目录路径 -> 树节点
+        self.compare_region = None
+        self.region_mode = None
+        self.region_items = []
+        self.diff_items = []
+        self.expect_item = None
+        self.runtime_item = None
+        self.diff_item = None
+        self.pixmap_cache = CPixmapCache()
         self.screenshot_list = []
         self.list_index = None
         self.df = None
-        self.last_time = None
         self.root_item = None
         self.child_item = None
         self.grandchild_item = None
@@ -39,8 +48,7 @@ class CMainWindow:
         self.module_name = None
         self.case_number = None
         self.case_title = None
-        self.mouse_listener = None
-        self.keyboard_listener = None
+        self.worker = None  # 正在执行的录制、录制截图或回放线程
 
         # 获取当前用户的主目录路径
         self.home_dir = os.path.expanduser("~")
@@ -57,6 +65,8 @@ class CMainWindow:
         self.playback_dir = os.path.join(self.test_data_dir, "回放数据")
         if not os.path.exists(self.playback_dir):
             os.makedirs(self.playback_dir)
+        self.case_catalog = CCaseCatalog(self.test_data_dir, self.record_dir, self.playback_dir)
+        self.case_catalog.reconcile()
 
         # QLineEdit输入规则
         self.main_window.softwareNameEdit.setValidator(
@@ -69,33 +79,52 @@ class CMainWindow:
             QRegExpValidator(QRegExp("[A-Za-z0-9._]+"), self.main_window))
 
         # ModuleNameEdit命名规范
-        with open("../resource/configure/edit_information.txt", 'r', encoding='utf-8') as f:
+        with open(resourcePath("configure", "edit_information.txt"), 'r', encoding='utf-8') as f:
             self.main_window.moduleNameEdit.setToolTip(f.read())
 
         # RecordButton录制注意事项
-        with open("../resource/configure/button_information.txt", 'r', encoding='utf-8') as f:
+        with open(resourcePath("configure", "button_information.txt"), 'r', encoding='utf-8') as f:
             self.main_window.recordBtn.setToolTip(f.read())
 
         # 主界面初始化
-        self.main_window.setWindowIcon(QIcon("../resource/icon/client.ico"))
-        self.instruction.setWindowIcon(QIcon("../resource/icon/instruction.ico"))
-        self.image_comparison.setWindowIcon(QIcon("../resource/icon/image.ico"))
+        self.main_window.setWindowIcon(QIcon(resourcePath("icon", "client.ico")))
+        self.instruction.setWindowIcon(QIcon(resourcePath("icon", "instruction.ico")))
+        self.image_comparison.setWindowIcon(QIcon(resourcePath("icon", "image.ico")))
 
         # QTreeWidget初始化
-        self.treeInitialization(self.main_window.tree, self.record_dir)
+        self.treeInitialization()
 
-        # QTableWidget初始化
+        # QTableView初始化
+        self.table_model = CRecordingTableModel(self.main_window)
+        self.main_window.table.setModel(self.table_model)
         self.main_window.table.horizontalHeader().setSectionsClickable(False)
         self.main_window.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
+        # 录制截图、回放进度
+        self.window_title = self.main_window.windowTitle()
+        self.progress_bar = QProgressBar(self.main_window)
+        self.progress_bar.setMaximumWidth(240)
+        self.progress_bar.hide()
+        self.main_window.statusBar.addPermanentWidget(self.progress_bar)
+
         # QCombobox初始化
         self.main_window.softwareNameSearch.lineEdit().setPlaceholderText("请输入软件名称查询")
         font = self.main_window.softwareNameSearch.lineEdit().font()
         font.setFamily("Microsoft YaHei UI")
         font.setPointSize(11)
         self.main_window.softwareNameSearch.lineEdit().setFont(font)
+        self.main_window.softwareNameSearch.addItems(self.case_catalog.softwareNames())
         self.main_window.softwareNameSearch.setCurrentIndex(-1)
 
+        # 监视软件、模块目录，外部新增或删除用例时同步索引和目录树
+        self.catalog_watcher = QFileSystemWatcher(self.main_window)
+        self.catalog_watcher.addPaths(
+            [path for path, item in self.tree_items.items() if self.case_catalog.level(path) < CASE_LEVEL])
+        self.catalog_watcher.directoryChanged.connect(self.catalogReconcile)
+
+        # 回放速度
+        self.main_window.playbackSpeedCombo.addItems(list(PLAYBACK_SPEEDS))
+
         # QGraphicsView初始化
         self.image_comparison.expectScene = QGraphicsScene(self.image_comparison)
         self.image_comparison.runtimeScene = QGraphicsScene(self.image_comparison)
@@ -104,6 +133,16 @@ class CMainWindow:
         self.image_comparison.imageLayout = QHBoxLayout(self.image_comparison.graphicsFrame)
         self.image_comparison.imageLayout.addWidget(self.image_comparison.expectView)
         self.image_comparison.imageLayout.addWidget(self.image_comparison.runtimeView)
+        # 每个场景只保留一个图片项，切换步骤时替换图片
+        self.expect_item = CPyramidPixmapItem()
+        self.runtime_item = CPyramidPixmapItem()
+        self.diff_item = CPyramidPixmapItem()  # 叠加在回放图片上的差异热力图
+        self.image_comparison.expectScene.addItem(self.expect_item)
+        self.image_comparison.runtimeScene.addItem(self.runtime_item)
+        self.image_comparison.runtimeScene.addItem(self.diff_item)
+        self.image_comparison.expectView.setScene(self.image_comparison.expectScene)
+        self.image_comparison.runtimeView.setScene(self.image_comparison.runtimeScene)
+        self.image_comparison.expectView.linkView(self.image_comparison.runtimeView)
 
         # 连接槽函数
         self.main_window.instruction.triggered.connect(self.showInstruction)
@@ -117,12 +156,18 @@ class CMainWindow:
         self.main_window.caseNumberEdit.textChanged.connect(self.caseNumberUpdate)
         self.main_window.caseTitleEdit.textChanged.connect(self.caseTitleUpdate)
         self.main_window.tree.currentItemChanged.connect(self.treeCurrentItemUpdate)
-        self.main_window.table.cellDoubleClicked.connect(self.imageComparisonShow)
+        self.main_window.table.doubleClicked.connect(self.tableDoubleClicked)
         self.image_comparison.preBtn.clicked.connect(self.previousButtonClicked)
         self.image_comparison.nextBtn.clicked.connect(self.nextButtonClicked)
+        self.image_comparison.regionBtn.clicked.connect(self.regionButtonClicked)
+        self.image_comparison.ignoreBtn.clicked.connect(self.ignoreButtonClicked)
+        self.image_comparison.clearRegionBtn.clicked.connect(self.clearRegionButtonClicked)
+        self.image_comparison.diffCheck.toggled.connect(self.diffOverlayUpdate)
+        self.image_comparison.expectView.regionSelected.connect(self.regionSelected)
 
     def showInstruction(self):
-        with open("../resource/configure/instruction.md", 'r', encoding='utf-8') as f:
+        import markdown
+        with open(resourcePath("configure", "instruction.md"), 'r', encoding='utf-8') as f:
             md_content = f.read()
         html_content = markdown.markdown(md_content)
         self.instruction.instructionBrowser.setHtml(html_content)
@@ -141,27 +186,65 @@ class CMainWindow:
         self.case_title = text
 
     def comboBoxUpDate(self, name):
-        self.main_window.softwareNameSearch.addItem(name)
+        # 按名称顺序插入，不重建整个下拉列表
         items = [self.main_window.softwareNameSearch.itemText(i) for i in
                  range(self.main_window.softwareNameSearch.count())]
-        items.sort()
-        self.main_window.softwareNameSearch.clear()
-        for item in items:
-            self.main_window.softwareNameSearch.addItem(item)
+        self.main_window.softwareNameSearch.insertItem(bisect.bisect(items, name), name)
         self.main_window.softwareNameSearch.setCurrentIndex(-1)
 
-    def treeInitialization(self, parent, path):
-        for name in os.listdir(path):
-            full_path = os.path.join(path, name)
-            if not (os.path.isdir(full_path) and os.path.basename(full_path) != "expect_image"):
+    def treeInitialization(self):
+        # 从用例索引一次性构建目录树，索引保证上级节点先于下级
+        self.tree_items = {self.record_dir: self.main_window.tree.invisibleRootItem()}
+        for path, parent, name, level in self.case_catalog.nodes():
+            if parent not in self.tree_items:
                 continue
-            item = QTreeWidgetItem(parent, [name])
-            item.setData(0, Qt.UserRole, full_path)
-            if path == self.record_dir:
-                self.comboBoxUpDate(name)
-                item.setHidden(True)
-            if os.path.isdir(full_path) and os.path.basename(full_path) != "expect_image":
-                self.treeInitialization(item, full_path)
+            item = QTreeWidgetItem(self.tree_items[parent], [name])
+            item.setData(0, Qt.UserRole, path)
+            item.setHidden(level == 1)
+            self.tree_items[path] = item
+
+    def treeItemCreate(self, path):
+        # 为已加入索引的目录创建树节点
+        parent_item = self.tree_items[os.path.dirname(path)]
+        item = QTreeWidgetItem(parent_item, [os.path.basename(path)])
+        item.setData(0, Qt.UserRole, path)
+        self.tree_items[path] = item
+        if self.case_catalog.level(path) == 1:
+            self.comboBoxUpDate(item.text(0))
+        if self.case_catalog.level(path) < CASE_LEVEL:
+            self.catalog_watcher.addPath(path)
+        return item
+
+    def treeItemUpdate(self, path):
+        # 目录对应的树节点，目录不存在时创建目录并加入索引
+        if not os.path.exists(path):
+            os.makedirs(path)
+        if path not in self.tree_items:
+            self.case_catalog.addNode(path)
+            return self.treeItemCreate(path)
+        return self.tree_items[path]
+
+    def catalogReconcile(self, path):
+        added, removed = self.case_catalog.reconcileDir(path)
+        for removed_path in removed:
+            item = self.tree_items.get(removed_path)
+            if item is None:
+                continue
+            prefix = removed_path + os.sep
+            for key in [key for key in self.tree_items if key == removed_path or key.startswith(prefix)]:
+                if self.tree_items[key] in (self.root_item, self.child_item, self.grandchild_item):
+                    self.levelJudge(1, None)
+                del self.tree_items[key]
+            (item.parent() or self.main_window.tree.invisibleRootItem()).removeChild(item)
+            if self.case_catalog.level(removed_path) == 1:
+                index = self.main_window.softwareNameSearch.findText(item.text(0))
+                if index >= 0:
+                    self.main_window.softwareNameSearch.removeItem(index)
+            if not self.grandchild_item:
+                self.tableUpdate()
+        for added_path in added:
+            if added_path not in self.tree_items and os.path.dirname(added_path) in self.tree_items:
+                self.treeItemCreate(added_path).setHidden(self.case_catalog.level(added_path) == 1)
 
     def otherNodeHide(self, current_item):
         for i in range(self.main_window.tree.topLevelItemCount()):
@@ -214,6 +297,8 @@ class CMainWindow:
             self.main_window.softwareNameEdit.setText("")
 
     def treeCurrentItemUpdate(self, current_item):
+        if current_item is None:
+            return
         current_dir = current_item.data(0, Qt.UserRole)
         level = 0
         while current_dir != self.record_dir:
@@ -223,132 +308,13 @@ class CMainWindow:
         self.lineEditUpdate()
         self.tableUpdate()
 
-    @staticmethod
-    def keyJudge(key):
-        try:
-            return key.char
-        except AttributeError:
-            parts = str(key).split(".")
-            return parts[1]
-
-    def onMouseMove(self, x, y):
-        if time.time() - self.last_time < 0.15:
-            return
-        csv_list = [int((time.time() - self.last_time) * 1000),
-                    "Mouse", "mouse move", [x, y], "", ""]
-        self.csvUpdate(csv_list)
-
-    def onMouseClick(self, x, y, button, pressed):
-        if button != mouse.Button.left and button != mouse.Button.right and button != mouse.Button.middle:
-            return
-        if pressed:
-            csv_list = [int((time.time() - self.last_time) * 1000),
-                        "Mouse", "mouse " + button.name + " down", [x, y], "", ""]
-            self.csvUpdate(csv_list)
-        else:
-            csv_list = [int((time.time() - self.last_time) * 1000),
-                        "Mouse", "mouse " + button.name + " up", [x, y], "", ""]
-            self.csvUpdate(csv_list)
-
-    def onMouseWheel(self, x, y, dx, dy):
-        if dy > 0:
-            csv_list = [int((time.time() - self.last_time) * 1000),
-                        "Mouse", "mouse wheel up", [x, y], "", ""]
-        else:
-            csv_list = [int((time.time() - self.last_time) * 1000),
-                        "Mouse", "mouse wheel down", [x, y], "", ""]
-        self.csvUpdate(csv_list)
-
-    def onKeyboardDown(self, key):
-        if key == keyboard.Key.esc:
-            self.mouse_listener.stop()
-            self.keyboard_listener.stop()
-            return
-        csv_list = [int((time.time() - self.last_time) * 1000),
-                    "Keyboard", "key down", self.keyJudge(key), "", ""]
-        self.csvUpdate(csv_list)
-
-    def onKeyboardUp(self, key):
-        csv_list = [int((time.time() - self.last_time) * 1000),
-                    "Keyboard", "key up", self.keyJudge(key), "", ""]
-        self.csvUpdate(csv_list)
-
-    def monitor(self):
-        self.mouse_listener = mouse.Listener(
-            on_move=self.onMouseMove, on_click=self.onMouseClick, on_scroll=self.onMouseWheel)
-        self.keyboard_listener = keyboard.Listener(on_press=self.onKeyboardDown, on_release=self.onKeyboardUp)
-        self.mouse_listener.start()
-        self.keyboard_listener.start()
-        self.last_time = time.time()
-        self.mouse_listener.join()
-        self.keyboard_listener.join()
-        self.tableUpdate()
-
-    def csvUpdate(self, csv_list):
-        csv_path = os.path.join(self.grandchild_item.data(0, Qt.UserRole), self.case_title + ".csv")
-        with open(csv_path, mode='a', encoding='utf-8', newline='') as csv_file:
-            csv.writer(csv_file).writerow(csv_list)
-        self.last_time = time.time()
-
-    def dirJudge(self):
-        temp_dir = self.grandchild_item.data(0, Qt.UserRole).replace(self.record_dir, self.playback_dir)
-        if not os.path.exists(
-                self.grandchild_item.data(0, Qt.UserRole).replace(self.record_dir, self.playback_dir)):
-            temp_dir = self.grandchild_item.data(0, Qt.UserRole)
-        return temp_dir
-
     def getCsvName(self):
-        csv_dir = self.dirJudge()
-        files = glob.glob(f"{csv_dir}/*.csv")
-        if files:
-            return files[0]
-
-    def clickStepColor(self, row):
-        step_state = str(self.df.iloc[row, 5])
-        for col in range(self.df.shape[1]):
-            item = QTableWidgetItem(str(self.df.iloc[row, col]))
-            self.main_window.table.setItem(row, col, item)
-            if step_state == "nan":
-                item.setBackground(QColor(0, 190, 225))
-            elif step_state == "通过":
-                if self.passed == 0:
-                    self.passed = 1
-                item.setBackground(QColor(0, 250, 26))
-            elif step_state == "失败":
-                self.passed = 2
-                item.setBackground(QColor(255, 39, 0))
-
-    def createTableItem(self):
-        self.main_window.table.setRowCount(self.df.shape[0])
-        self.main_window.table.setColumnCount(self.df.shape[1])
-        self.main_window.table.setHorizontalHeaderLabels(self.df.columns)
-        for row in range(self.df.shape[0]):
-            if row < self.df.shape[0] - 1:
-                if (str(self.df.iloc[row, 2]) == "mouse left up"
-                        and ((str(self.df.iloc[row + 1, 2]) != "mouse left down"
-                              and str(self.df.iloc[row + 1, 2]) != "mouse right down")
-                             or self.df.iloc[row + 1, 0] > 200)):
-                    self.screenshot_list.append(row + 1)
-                    self.clickStepColor(row)
-                elif (str(self.df.iloc[row, 2]) == "mouse right up"
-                      and ((str(self.df.iloc[row + 1, 2]) != "mouse left down"
-                            and str(self.df.iloc[row + 1, 2]) != "mouse right down")
-                           or self.df.iloc[row + 1, 0] > 200)):
-                    self.screenshot_list.append(row + 1)
-                    self.clickStepColor(row)
-                else:
-                    for col in range(self.df.shape[1]):
-                        item = QTableWidgetItem(str(self.df.iloc[row, col]))
-                        self.main_window.table.setItem(row, col, item)
-            else:
-                if (str(self.df.iloc[row, 2]) == "mouse left up"
-                        or str(self.df.iloc[row, 2]) == "mouse right up"):
-                    self.screenshot_list.append(row + 1)
-                    self.clickStepColor(row)
-                else:
-                    for col in range(self.df.shape[1]):
-                        item = QTableWidgetItem(str(self.df.iloc[row, col]))
-                        self.main_window.table.setItem(row, col, item)
+        return self.case_catalog.csvPath(self.grandchild_item.data(0, Qt.UserRole))
+
+    def createTableItem(self, analysis):
+        self.screenshot_list = list(analysis.checkpoints)
+        self.passed = analysis.status
+        self.table_model.setFrame(self.df, [row - 1 for row in self.screenshot_list])
 
     def statusBarUpdate(self):
         if self.df.shape[0] == 0:
@@ -362,75 +328,104 @@ class CMainWindow:
 
     def tableUpdate(self):
         if not self.grandchild_item:
-            self.main_window.table.setRowCount(0)
-            self.main_window.table.setColumnCount(0)
+            self.table_model.clear()
             self.main_window.statusBar.showMessage("")
             return
         if not self.getCsvName():
             self.main_window.statusBar.showMessage("")
             return
         self.passed = 0
-        self.screenshot_list.clear()
-        self.df = pd.read_csv(self.getCsvName(), encoding='utf8')
-        self.createTableItem()
+        self.screenshot_list = []
+        from recording_cache import readCaseData
+        case_data = readCaseData(self.getCsvName())
+        self.df = case_data.df
+        self.createTableItem(case_data.analysis)
         self.statusBarUpdate()
+        self.catalogCaseUpdate()
+
+    def catalogCaseUpdate(self):
+        # 步骤数、截图数和回放结果有变化时写入索引
+        case_dir = self.grandchild_item.data(0, Qt.UserRole)
+        fields = (self.df.shape[0], len(self.screenshot_list), CASE_RESULTS[self.passed])
+        row = self.case_catalog.case(case_dir)
+        if row is not None and tuple(row[2:]) != fields:
+            self.case_catalog.updateCase(case_dir, steps=fields[0], checkpoints=fields[1], result=fields[2])
 
     def recordFileCatalogUpdate(self):
         # root目录
         root_dir = os.path.join(self.record_dir, self.software_name)
-        if not os.path.exists(root_dir):
-            os.makedirs(root_dir)
-            self.root_item = QTreeWidgetItem(self.main_window.tree, [self.software_name])
-            self.root_item.setData(0, Qt.UserRole, root_dir)
-            self.comboBoxUpDate(self.software_name)
-        else:
-            for i in range(self.main_window.tree.topLevelItemCount()):
-                item = self.main_window.tree.topLevelItem(i)
-                if item.text(0) == self.software_name:
-                    self.root_item = item
-                    break
+        self.root_item = self.treeItemUpdate(root_dir)
         self.otherNodeHide(self.root_item)
         # child目录
         child_dir = os.path.join(root_dir, self.module_name)
-        if not os.path.exists(child_dir):
-            os.makedirs(child_dir)
-            self.child_item = QTreeWidgetItem(self.root_item, [self.module_name])
-            self.child_item.setData(0, Qt.UserRole, child_dir)
-        else:
-            for i in range(self.root_item.childCount()):
-                item = self.root_item.child(i)
-                if item.text(0) == self.module_name:
-                    self.child_item = item
-                    break
+        self.child_item = self.treeItemUpdate(child_dir)
         # grandchild目录
         grandchild_dir = os.path.join(child_dir, self.case_number)
-        if not os.path.exists(grandchild_dir):
-            os.makedirs(grandchild_dir)
-            self.grandchild_item = QTreeWidgetItem(self.child_item, [self.case_number])
-            self.grandchild_item.setData(0, Qt.UserRole, grandchild_dir)
-        else:
-            for i in range(self.child_item.childCount()):
-                item = self.child_item.child(i)
-                if item.text(0) == self.case_number:
-                    self.grandchild_item = item
-                    break
+        self.grandchild_item = self.treeItemUpdate(grandchild_dir)
         self.main_window.tree.setCurrentItem(self.grandchild_item)
 
     def deleteCase(self):
+        from recording_cache import file_cache
+        self.caseRunner().releaseCase(self.grandchild_item.data(0, Qt.UserRole))
         if os.path.exists(self.grandchild_item.data(0, Qt.UserRole)):
             shutil.rmtree(self.grandchild_item.data(0, Qt.UserRole))
         playback_data_dir = self.grandchild_item.data(0, Qt.UserRole).replace(self.record_dir, self.playback_dir)
         if os.path.exists(playback_data_dir):
             shutil.rmtree(playback_data_dir)
-        self.main_window.table.setRowCount(0)
-        self.main_window.table.setColumnCount(0)
+        self.case_catalog.removeNode(self.grandchild_item.data(0, Qt.UserRole))
+        file_cache.invalidate(self.grandchild_item.data(0, Qt.UserRole))
+        file_cache.invalidate(playback_data_dir)
+        self.table_model.clear()
+
+    def workerStart(self, worker, on_finished):
+        # 执行期间禁止切换用例和重复操作；主界面最小化，进度同时显示在窗口标题（任务栏）中
+        self.worker = worker
+        self.main_window.centralWidget.setEnabled(False)
+        worker.finished.connect(on_finished)
+        worker.start()
+
+    def workerFinish(self):
+        worker, self.worker = self.worker, None
+        worker.deleteLater()
+        self.main_window.centralWidget.setEnabled(True)
+        self.progress_bar.hide()
+        self.main_window.setWindowTitle(self.window_title)
+        self.main_window.showNormal()
+        self.case_catalog.refreshCase(self.grandchild_item.data(0, Qt.UserRole))
+        self.tableUpdate()
+        return worker
+
+    def progressMessage(self, message):
+        self.main_window.statusBar.showMessage(message)
+        self.main_window.setWindowTitle(message + " - " + self.window_title)
+
+    def recordProgress(self, count):
+        self.progressMessage(f"正在录制：{count}个事件，按ESC结束")
+
+    def screenshotProgress(self, current, total, passed, failed):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(current)
+        self.progress_bar.show()
+        self.progressMessage(f"正在录制截图：第{current}/{total}步，按{ABORT_HOTKEY_TEXT}中止")
+
+    def playbackProgress(self, current, total, passed, failed):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(current)
+        self.progress_bar.show()
+        self.progressMessage(f"正在回放：第{current}/{total}步，通过{passed}，失败{failed}，按{ABORT_HOTKEY_TEXT}中止")
 
     def record(self):
-        header = ["操作间隔", "按键类别", "事件类型", "输入数据", "相似度", "结果"]
-        self.csvUpdate(header)
         self.main_window.showMinimized()
-        self.monitor()
-        self.main_window.showNormal()
+        worker = CRecordWorker(
+            os.path.join(self.grandchild_item.data(0, Qt.UserRole), self.case_title + ".csv"), self.main_window)
+        worker.progress.connect(self.recordProgress)
+        self.workerStart(worker, self.recordFinished)
+
+    def recordFinished(self):
+        worker = self.workerFinish()
+        if worker.error:
+            QMessageBox.critical(self.main_window, "错误", "录制出错！\n" + worker.error)
+            return
         QMessageBox.information(self.main_window, "提示", "录制结束，若显示数据为空请重新录制！")
 
     def recordButtonRunnableJudge(self):
@@ -451,6 +446,7 @@ class CMainWindow:
                 if warning_box == QMessageBox.Yes:
                     self.deleteCase()
                     os.makedirs(self.grandchild_item.data(0, Qt.UserRole))
+                    self.case_catalog.addNode(self.grandchild_item.data(0, Qt.UserRole))
                 return
             self.record()
 
@@ -458,85 +454,22 @@ class CMainWindow:
         self.recordButtonRunnableJudge()
 
     def Screenshot(self):
-        playback_data_dir = self.grandchild_item.data(0, Qt.UserRole).replace(self.record_dir, self.playback_dir)
-        if os.path.exists(playback_data_dir):
-            shutil.rmtree(playback_data_dir)
-        is_screenshot = False
-        m = Controller()
-        index = 0
-        parts = []
-        expect_image_dir = os.path.join(self.grandchild_item.data(0, Qt.UserRole), "expect_image")
-        if not os.path.exists(expect_image_dir):
-            os.makedirs(expect_image_dir)
-        else:
-            shutil.rmtree(expect_image_dir)
-            os.makedirs(expect_image_dir)
-        for row in range(self.df.shape[0]):
-            lapse_time = self.df.iloc[row, 0] * 0.001 + 0.01
-            event_type = str(self.df.iloc[row, 2])
-            input_data = str(self.df.iloc[row, 3])
-            parts.clear()
-            input_data = input_data.replace("[", "")
-            input_data = input_data.replace("]", "")
-            parts = input_data.split(", ")
-            if event_type == "mouse move":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-            elif event_type == "mouse left down":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                pyautogui.mouseDown()
-            elif event_type == "mouse left up":
-                time.sleep(lapse_time)
-                pyautogui.mouseUp()
-                if row != self.screenshot_list[index] - 1:
-                    continue
-                index += 1
-                time.sleep(2)
-                is_screenshot = True
-                pyautogui.screenshot().save(os.path.join(expect_image_dir, str(row + 1) + ".png"))
-            elif event_type == "mouse right down":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                pyautogui.mouseDown(button="right")
-            elif event_type == "mouse right up":
-                time.sleep(lapse_time)
-                pyautogui.mouseUp(button="right")
-                if row != self.screenshot_list[index] - 1:
-                    continue
-                index += 1
-                time.sleep(2)
-                is_screenshot = True
-                pyautogui.screenshot().save(os.path.join(expect_image_dir, str(row + 1) + ".png"))
-            elif event_type == "mouse middle down":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                pyautogui.mouseDown(button="middle")
-            elif event_type == "mouse middle up":
-                time.sleep(lapse_time)
-                pyautogui.mouseUp(button="middle")
-            elif event_type == "mouse wheel down":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                m.scroll(0, -1)
-            elif event_type == "mouse wheel up":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                m.scroll(0, 1)
-            elif event_type == "key down":
-                time.sleep(lapse_time)
-                pyautogui.keyDown(parts[0])
-            elif event_type == "key up":
-                time.sleep(lapse_time)
-                pyautogui.keyUp(parts[0])
-            elif event_type == "nan":
-                time.sleep(lapse_time)
-        self.main_window.showNormal()
-        if not is_screenshot:
+        case_runner = self.caseRunner()
+        worker = CPlaybackWorker(
+            case_runner, case_runner.screenshot, self.grandchild_item.data(0, Qt.UserRole), self.main_window)
+        worker.progress.connect(self.screenshotProgress)
+        self.workerStart(worker, self.screenshotFinished)
+
+    def screenshotFinished(self):
+        worker = self.workerFinish()
+        if worker.aborted:
+            QMessageBox.information(self.main_window, "提示", "录制截图已中止，需重新录制截图！")
+        elif worker.error:
+            QMessageBox.critical(self.main_window, "错误", "录制截图出错！\n" + worker.error)
+        elif not worker.result[0]:
             QMessageBox.critical(self.main_window, "错误", "无有效鼠标输入！")
-            shutil.rmtree(expect_image_dir)
         else:
-            QMessageBox.information(self.main_window, "提示", "录制截图正常！")
+            QMessageBox.information(self.main_window, "提示", "录制截图正常！\n" + latenessMessage(worker.result[1]))
 
     def screenshotButtonRunnableJudge(self):
         if not self.software_name:
@@ -564,22 +497,121 @@ class CMainWindow:
         if not os.path.exists(playback_data_dir):
             os.makedirs(playback_data_dir)
         else:
+            self.caseRunner().store.release(os.path.join(playback_data_dir, "runtime_image"))
             shutil.rmtree(playback_data_dir)
             os.makedirs(playback_data_dir)
 
+    def imagePaths(self, step_name):
+        # 返回(预期图片路径, 回放图片路径)
+        record_image_dir = os.path.join(self.grandchild_item.data(0, Qt.UserRole), "expect_image")
+        playback_image_dir = os.path.join(
+            self.grandchild_item.data(0, Qt.UserRole).replace(self.record_dir, self.playback_dir), "runtime_image")
+        return (os.path.join(record_image_dir, str(step_name) + ".png"),
+                os.path.join(playback_image_dir, str(step_name) + ".png"))
+
+    def diffImagePath(self, step_name):
+        from image_compare import DIFF_DIR
+        playback_image_dir = os.path.dirname(self.imagePaths(step_name)[1])
+        return os.path.join(playback_image_dir, DIFF_DIR, str(step_name) + ".png")
+
     def showImage(self):
         step_name = self.screenshot_list[self.list_index]
         self.image_comparison.setWindowTitle(
             "查看第" + str(step_name) + "步图片，结果：" + str(self.df.iloc[step_name - 1, 5]))
-        record_image_dir = os.path.join(self.grandchild_item.data(0, Qt.UserRole), "expect_image")
-        playback_image_dir = os.path.join(
-            self.grandchild_item.data(0, Qt.UserRole).replace(self.record_dir, self.playback_dir), "runtime_image")
-        record_image_path = os.path.join(record_image_dir, str(self.screenshot_list[self.list_index]) + ".png")
-        playback_image_path = os.path.join(playback_image_dir, str(self.screenshot_list[self.list_index]) + ".png")
-        self.image_comparison.expectScene.addPixmap(QPixmap(record_image_path))
-        self.image_comparison.runtimeScene.addPixmap(QPixmap(playback_image_path))
-        self.image_comparison.expectView.setScene(self.image_comparison.expectScene)
-        self.image_comparison.runtimeView.setScene(self.image_comparison.runtimeScene)
+        record_image_path, playback_image_path = self.imagePaths(step_name)
+        playback_image_dir = os.path.dirname(playback_image_path)
+        self.expect_item.setPixmap(self.pixmap_cache.pixmap(record_image_path))
+        self.runtime_item.setPixmap(self.pixmap_cache.pixmap(playback_image_path))
+        # 回放时只截取了比对区域，按区域左上角对齐到预期图片坐标
+        from recording_cache import file_cache
+        runtime_region = file_cache.get(
+            "regions", os.path.join(playback_image_dir, RUNTIME_REGION_FILE),
+            lambda path: loadRuntimeRegions(playback_image_dir)).get(str(step_name))
+        self.runtime_item.setOffset(*(runtime_region[:2] if runtime_region else (0, 0)))
+        self.diff_item.setPixmap(self.pixmap_cache.pixmap(self.diffImagePath(step_name)))
+        self.diff_item.setOffset(self.runtime_item.offset())
+        # 两个场景使用相同的坐标范围，同步缩放平移时位置一一对应
+        scene_rect = self.expect_item.sceneBoundingRect().united(self.runtime_item.sceneBoundingRect())
+        self.image_comparison.expectScene.setSceneRect(scene_rect)
+        self.image_comparison.runtimeScene.setSceneRect(scene_rect)
+        self.regionOverlayUpdate()
+        self.diffOverlayUpdate()
+        self.imagePrefetch()
+
+    def imagePrefetch(self):
+        # 后台解码前后相邻截图步骤的图片
+        paths = []
+        for index in (self.list_index + 1, self.list_index - 1, self.list_index + 2, self.list_index - 2):
+            if 0 <= index < len(self.screenshot_list):
+                paths.extend(self.imagePaths(self.screenshot_list[index]))
+                paths.append(self.diffImagePath(self.screenshot_list[index]))
+        self.pixmap_cache.prefetch(paths)
+
+    def regionOverlayUpdate(self):
+        for item in self.region_items:
+            item.scene().removeItem(item)
+        self.region_items.clear()
+        step_name = self.screenshot_list[self.list_index]
+        region = self.compare_region.region(step_name)
+        for scene in (self.image_comparison.expectScene, self.image_comparison.runtimeScene):
+            if region:
+                self.region_items.append(scene.addRect(QRectF(*region), QPen(QColor(0, 250, 26), 3)))
+            for ignore in self.compare_region.ignores(step_name):
+                self.region_items.append(
+                    scene.addRect(QRectF(*ignore), QPen(Qt.NoPen), QBrush(QColor(128, 128, 128, 160))))
+
+    def diffOverlayUpdate(self):
+        # 差异热力图和差异区域在比对时已生成，这里只读取并显示
+        for item in self.diff_items:
+            item.scene().removeItem(item)
+        self.diff_items.clear()
+        visible = self.image_comparison.diffCheck.isChecked()
+        self.diff_item.setVisible(visible)
+        if not visible:
+            return
+        from image_compare import DIFF_FILE, loadDiffRegions
+        from recording_cache import file_cache
+        step_name = self.screenshot_list[self.list_index]
+        playback_image_dir = os.path.dirname(self.imagePaths(step_name)[1])
+        diff_regions = file_cache.get(
+            "diff", os.path.join(playback_image_dir, DIFF_FILE),
+            lambda path: loadDiffRegions(playback_image_dir)).get(str(step_name), [])
+        for scene in (self.image_comparison.expectScene, self.image_comparison.runtimeScene):
+            for box in diff_regions:
+                self.diff_items.append(scene.addRect(QRectF(*box), QPen(QColor(255, 0, 0), 2)))
+
+    def regionButtonClicked(self):
+        self.region_mode = "region"
+        self.image_comparison.expectView.startRegionSelection()
+
+    def ignoreButtonClicked(self):
+        self.region_mode = "ignore"
+        self.image_comparison.expectView.startRegionSelection()
+
+    def regionStepName(self):
+        if self.image_comparison.caseRegionCheck.isChecked():
+            return None
+        return self.screenshot_list[self.list_index]
+
+    def regionSelected(self, rect):
+        rect = rect.intersected(self.expect_item.sceneBoundingRect()).toRect()
+        if rect.isEmpty():
+            return
+        region = [rect.x(), rect.y(), rect.width(), rect.height()]
+        if self.region_mode == "region":
+            if min(rect.width(), rect.height()) < MIN_REGION_SIZE:
+                QMessageBox.critical(self.main_window, "错误", f"比对区域宽高不能小于{MIN_REGION_SIZE}像素！")
+                return
+            self.compare_region.setRegion(region, self.regionStepName())
+        else:
+            self.compare_region.addIgnore(region, self.regionStepName())
+        self.compare_region.save()
+        self.regionOverlayUpdate()
+
+    def clearRegionButtonClicked(self):
+        self.compare_region.clear(self.regionStepName())
+        self.compare_region.save()
+        self.regionOverlayUpdate()
 
     def previousButtonClicked(self):
         if self.list_index == 0:
@@ -597,10 +629,14 @@ class CMainWindow:
         self.image_comparison.preBtn.setEnabled(True)
         self.showImage()
 
+    def tableDoubleClicked(self, index):
+        self.imageComparisonShow(index.row())
+
     def imageComparisonShow(self, row):
         if str(self.df.iloc[row, 5]) == "nan":
             return
         self.list_index = self.screenshot_list.index(row + 1)
+        self.compare_region = CCompareRegion(self.grandchild_item.data(0, Qt.UserRole))
         self.image_comparison.preBtn.setEnabled(True)
         self.image_comparison.nextBtn.setEnabled(True)
         if self.list_index == 0:
@@ -610,96 +646,32 @@ class CMainWindow:
         self.showImage()
         self.image_comparison.show()
 
-    def imageComparison(self, row, playback_image_dir, record_image_dir):
-        playback_image_path = os.path.join(playback_image_dir, str(row + 1) + ".png")
-        record_image_path = os.path.join(record_image_dir, str(row + 1) + ".png")
-        playback_image = cv2.imdecode(np.fromfile(playback_image_path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
-        record_image = cv2.imdecode(np.fromfile(record_image_path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
-        playback_gray = cv2.cvtColor(playback_image, cv2.COLOR_BGR2GRAY)
-        record_gray = cv2.cvtColor(record_image, cv2.COLOR_BGR2GRAY)
-        ssim_value = compare_ssim(playback_gray, record_gray, multichannel=True)
-        self.df.iloc[row, 4] = round(ssim_value, 4)
-        if ssim_value > 0.985:
-            self.df.iloc[row, 5] = "通过"
-        else:
-            self.df.iloc[row, 5] = "失败"
+    def caseRunner(self):
+        # 首次录制截图、回放或删除用例时才创建，避免启动时加载图像处理和键鼠依赖
+        if self.case_runner is None:
+            from case_runner import CCaseRunner
+            self.case_runner = CCaseRunner(self.record_dir, self.playback_dir)
+        return self.case_runner
 
     def playback(self):
-        m = Controller()
-        index = 0
-        parts = []
-        playback_data_dir = self.grandchild_item.data(0, Qt.UserRole).replace(self.record_dir, self.playback_dir)
-        runtime_image_dir = os.path.join(playback_data_dir, "runtime_image")
-        if not os.path.exists(runtime_image_dir):
-            os.makedirs(runtime_image_dir)
+        case_runner = self.caseRunner()
+        case_runner.speed, case_runner.max_idle = PLAYBACK_SPEEDS[self.main_window.playbackSpeedCombo.currentText()]
+        case_runner.wait_target = self.main_window.waitTargetCheck.isChecked()
+        worker = CPlaybackWorker(
+            case_runner, case_runner.playback, self.grandchild_item.data(0, Qt.UserRole), self.main_window)
+        worker.progress.connect(self.playbackProgress)
+        self.workerStart(worker, self.playbackFinished)
+
+    def playbackFinished(self):
+        from target_wait import timeoutMessage
+        worker = self.workerFinish()
+        if worker.aborted:
+            QMessageBox.information(self.main_window, "提示", "回放已中止！")
+        elif worker.error:
+            QMessageBox.critical(self.main_window, "错误", "回放出错！\n" + worker.error)
         else:
-            shutil.rmtree(runtime_image_dir)
-            os.makedirs(runtime_image_dir)
-        for row in range(self.df.shape[0]):
-            lapse_time = self.df.iloc[row, 0] * 0.001 + 0.01
-            event_type = str(self.df.iloc[row, 2])
-            input_data = str(self.df.iloc[row, 3])
-            parts.clear()
-            input_data = input_data.replace("[", "")
-            input_data = input_data.replace("]", "")
-            parts = input_data.split(", ")
-            if event_type == "mouse move":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-            elif event_type == "mouse left down":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                pyautogui.mouseDown()
-            elif event_type == "mouse left up":
-                time.sleep(lapse_time)
-                pyautogui.mouseUp()
-                if row != self.screenshot_list[index] - 1:
-                    continue
-                index += 1
-                time.sleep(2)
-                pyautogui.screenshot().save(os.path.join(runtime_image_dir, str(row + 1) + ".png"))
-                self.imageComparison(row, runtime_image_dir,
-                                     os.path.join(self.grandchild_item.data(0, Qt.UserRole), "expect_image"))
-            elif event_type == "mouse right down":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                pyautogui.mouseDown(button="right")
-            elif event_type == "mouse right up":
-                time.sleep(lapse_time)
-                pyautogui.mouseUp(button="right")
-                if row != self.screenshot_list[index] - 1:
-                    continue
-                index += 1
-                time.sleep(2)
-                pyautogui.screenshot().save(os.path.join(runtime_image_dir, str(row + 1) + ".png"))
-                self.imageComparison(
-                    row, runtime_image_dir, os.path.join(self.grandchild_item.data(0, Qt.UserRole), "expect_image"))
-            elif event_type == "mouse middle down":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                pyautogui.mouseDown(button="middle")
-            elif event_type == "mouse middle up":
-                time.sleep(lapse_time)
-                pyautogui.mouseUp(button="middle")
-            elif event_type == "mouse wheel down":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                m.scroll(0, -1)
-            elif event_type == "mouse wheel up":
-                time.sleep(lapse_time)
-                pyautogui.moveTo(int(parts[0]), int(parts[1]))
-                m.scroll(0, 1)
-            elif event_type == "key down":
-                time.sleep(lapse_time)
-                pyautogui.keyDown(parts[0])
-            elif event_type == "key up":
-                time.sleep(lapse_time)
-                pyautogui.keyUp(parts[0])
-            elif event_type == "nan":
-                time.sleep(lapse_time)
-        self.main_window.showNormal()
-        QMessageBox.information(self.main_window, "提示", "回放结束！")
-        self.df.to_csv(os.path.join(playback_data_dir, self.case_title + ".csv"), index=False, encoding='utf-8')
+            QMessageBox.information(self.main_window, "提示", "回放结束！\n" + latenessMessage(worker.result.report)
+                                    + timeoutMessage(worker.result.target_timeouts))
 
     def playbackButtonRunnableJudge(self):
         if not self.software_name:
@@ -719,7 +691,6 @@ class CMainWindow:
             self.playbackFileCatalogUpdate()
             self.main_window.showMinimized()
             self.playback()
-            self.tableUpdate()
 
     def playbackButtonClicked(self):
         self.playbackButtonRunnableJudge()
@@ -740,6 +711,7 @@ class CMainWindow:
                 self.main_window, "警告", "是否删除当前用例？", QMessageBox.Yes | QMessageBox.No)
             if warning_box == QMessageBox.Yes:
                 self.deleteCase()
+                self.tree_items.pop(self.grandchild_item.data(0, Qt.UserRole), None)
                 self.child_item.removeChild(self.grandchild_item)
                 self.grandchild_item = None
                 QMessageBox.information(self.main_window, "提示", "测试用例已删除！")
@@ -0,0 +1,209 @@
+import argparse
+import glob
+import json
+import math
+import os
+import shutil
+import numpy as np
+from compare_region import REGION_FILE
+from recording_format import BUTTON_DOWN, BUTTON_UP, CEventType, CRecording, recordingPath
+from screenshot_store import STORE_DIR, STORE_INDEX, CScreenshotStore
+from target_wait import TARGET_DIR
+
+MOVE_DEVIATION = 2.0  # 中间点偏离首尾连线超过该像素数时视为拐点
+MOVE_MIN_DISTANCE = 3.0  # 短于该像素数的移动段不参与速度判断
+MOVE_SPEED_RATIO = 2.0  # 前后两段速度相差超过该倍数时保留
+MOVE_PAUSE = 0.1  # 两次移动间停顿超过该时间（秒）时保留停顿点
+MOVE_MAX_INTERVAL = 0.5  # 匀速移动时保留点的最长间隔（秒）
+TIME_SCALE = 100.0  # 离线精简时1秒折算的像素数，保留速度变化明显的点
+
+
+def pointDeviation(start, end, point):
+    # point到start-end连线的距离
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return math.hypot(point[0] - start[0], point[1] - start[1])
+    return abs(dx * (point[1] - start[1]) - dy * (point[0] - start[0])) / length
+
+
+def segmentSpeed(start, end):
+    # 返回(距离, 速度)，时间为纳秒
+    distance = math.hypot(end[0] - start[0], end[1] - start[1])
+    return distance, distance * 1e9 / max(end[2] - start[2], 1)
+
+
+class CMoveSampler:
+    # 录制时的自适应采样：保留方向、速度变化处的点，按键按住期间保留全部移动
+    def __init__(self, deviation=MOVE_DEVIATION, min_distance=MOVE_MIN_DISTANCE, speed_ratio=MOVE_SPEED_RATIO,
+                 pause=MOVE_PAUSE, max_interval=MOVE_MAX_INTERVAL):
+        self.deviation = deviation
+        self.min_distance = min_distance
+        self.speed_ratio = speed_ratio
+        self.pause_ns = int(pause * 1e9)
+        self.max_interval_ns = int(max_interval * 1e9)
+        self.anchor = None  # 上一个保留点(x, y, 纳秒时间戳)
+        self.pending = None  # 尚未决定是否保留的最新点
+        self.held = 0
+
+    def isTurn(self, point):
+        anchor, pending = self.anchor, self.pending
+        if point[2] - pending[2] > self.pause_ns or pending[2] - anchor[2] > self.max_interval_ns:
+            return True
+        if pointDeviation(anchor, point, pending) > self.deviation:
+            return True
+        before_distance, before_speed = segmentSpeed(anchor, pending)
+        after_distance, after_speed = segmentSpeed(pending, point)
+        if before_distance < self.min_distance or after_distance < self.min_distance:
+            return False
+        ratio = max(before_speed, after_speed) / max(min(before_speed, after_speed), 1e-9)
+        return ratio > self.speed_ratio
+
+    def move(self, x, y, now_ns):
+        # 返回需要写入的移动点列表
+        point = (x, y, now_ns)
+        if self.held or self.anchor is None:
+            self.anchor = point
+            return [point]
+        if self.pending is None:
+            self.pending = point
+            return []
+        kept = []
+        if self.isTurn(point):
+            kept.append(self.pending)
+            self.anchor = self.pending
+        self.pending = point
+        return kept
+
+    def flush(self):
+        # 其他事件发生前写入最后的位置，保证点击、悬停位置准确
+        if self.pending is None:
+            return []
+        kept, self.anchor, self.pending = self.pending, self.pending, None
+        return [kept]
+
+    def press(self):
+        self.held += 1
+
+    def release(self):
+        self.held = max(0, self.held - 1)
+
+
+def simplifyPoints(points, epsilon):
+    # Ramer-Douglas-Peucker，返回保留点的布尔掩码，首尾点始终保留
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    pending = [(0, len(points) - 1)]
+    while pending:
+        first, last = pending.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        direction = end - start
+        inner = points[first + 1:last] - start
+        length = np.linalg.norm(direction)
+        if length == 0:
+            distances = np.linalg.norm(inner, axis=1)
+        else:
+            # 三维（x、y、时间）叉积的模即到连线的距离乘以连线长度
+            distances = np.linalg.norm(np.cross(inner, direction), axis=1) / length
+        index = int(np.argmax(distances))
+        if distances[index] > epsilon:
+            split = first + 1 + index
+            keep[split] = True
+            pending.append((first, split))
+            pending.append((split, last))
+    return keep
+
+
+def simplifyMask(recording, epsilon=MOVE_DEVIATION, time_scale=TIME_SCALE):
+    # 只精简未按住鼠标键时的连续移动，每段移动的首尾点保留
+    events = recording.events["event"]
+    keep = np.ones(len(recording), dtype=bool)
+    is_move = events == CEventType.MOUSE_MOVE
+    held = np.cumsum(np.isin(events, BUTTON_DOWN).astype(np.int64) - np.isin(events, BUTTON_UP))
+    free_move = is_move & (held <= 0)
+    if not free_move.any():
+        return keep
+    times = np.cumsum(recording.events["delay"]) / 1e6 * time_scale
+    points = np.column_stack([recording.events["x"], recording.events["y"], times]).astype(np.float64)
+    edges = np.diff(np.concatenate(([0], free_move.astype(np.int8), [0])))
+    for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        if end - start > 2:
+            keep[start:end] = simplifyPoints(points[start:end], epsilon)
+    return keep
+
+
+def simplifyRecording(recording, keep):
+    # 删除的事件间隔并入下一个保留的事件，保留事件的绝对时刻不变
+    times = np.cumsum(recording.events["delay"])[keep]
+    events = np.array(recording.events[keep])
+    events["delay"] = np.diff(times, prepend=0)
+    return CRecording(events, recording.keys)
+
+
+def renumberImages(image_dir, step_map):
+    # 步骤号只会变小，按升序改名不会覆盖尚未改名的图片
+    if not os.path.isdir(image_dir):
+        return
+    for old_step, new_step in sorted(step_map.items()):
+        old_path = os.path.join(image_dir, f"{old_step}.png")
+        if old_step != new_step and os.path.exists(old_path):
+            os.replace(old_path, os.path.join(image_dir, f"{new_step}.png"))
+    index = CScreenshotStore.loadIndex(image_dir)
+    if index:
+        index = {f"{step_map.get(int(name[:-4]), name[:-4])}.png": digest for name, digest in index.items()}
+        with open(os.path.join(image_dir, STORE_INDEX), 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+
+def renumberRegions(case_dir, step_map):
+    path = os.path.join(case_dir, REGION_FILE)
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data["steps"] = {str(step_map.get(int(name), name)): config for name, config in data.get("steps", {}).items()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def simplifyCase(case_dir, playback_case_dir, store, epsilon=MOVE_DEVIATION):
+    # 精简用例录制数据，预期截图和比对区域按新步骤号改名，旧的回放数据删除；返回删除的事件数
+    csv_files = glob.glob(os.path.join(case_dir, "*.csv"))
+    if not csv_files:
+        return 0
+    csv_path = csv_files[0]
+    recording = CRecording.fromCsv(csv_path)
+    keep = simplifyMask(recording, epsilon)
+    removed = int(len(keep) - np.count_nonzero(keep))
+    if not removed:
+        return 0
+    new_rows = np.cumsum(keep) - 1
+    step_map = {int(row) + 1: int(new_rows[row]) + 1 for row in np.flatnonzero(keep)}
+    simplified = simplifyRecording(recording, keep)
+    simplified.toCsv(csv_path)
+    simplified.save(recordingPath(csv_path))
+    renumberImages(os.path.join(case_dir, "expect_image"), step_map)
+    renumberImages(os.path.join(case_dir, "expect_image", TARGET_DIR), step_map)
+    renumberRegions(case_dir, step_map)
+    store.release(os.path.join(playback_case_dir, "runtime_image"))
+    if os.path.exists(playback_case_dir):
+        shutil.rmtree(playback_case_dir)
+    return removed
+
+
+if __name__ == '__main__':
+    test_data_dir = os.path.join(os.path.expanduser("~"), "测试数据")
+    parser = argparse.ArgumentParser(description="精简已有录制数据中未按键时的鼠标移动轨迹")
+    parser.add_argument("--record-dir", default=os.path.join(test_data_dir, "录制数据"), help="录制数据目录")
+    parser.add_argument("--playback-dir", default=os.path.join(test_data_dir, "回放数据"), help="回放数据目录")
+    parser.add_argument("--epsilon", type=float, default=MOVE_DEVIATION, help="允许的轨迹偏差（像素）")
+    args = parser.parse_args()
+    case_store = CScreenshotStore(os.path.join(os.path.dirname(args.record_dir), STORE_DIR))
+    for case_path in sorted(glob.glob(os.path.join(args.record_dir, "*", "*", "*"))):
+        if not os.path.isdir(case_path):
+            continue
+        count = simplifyCase(case_path, case_path.replace(args.record_dir, args.playback_dir), case_store, args.epsilon)
+        if count:
+            print(f"{os.path.relpath(case_path, args.record_dir)}：删除{count}个移动事件")
@@ -0,0 +1,195 @@
+import multiprocessing
+import os
+import queue
+import shlex
+import subprocess
+import sys
+import time
+import traceback
+from batch_runner import EXIT_ERROR, buildParser, exitCode
+
+XVFB_START_TIMEOUT = 10  # 等待Xvfb就绪的最长时间（秒）
+
+
+class CXvfbDisplay:
+    def __init__(self, number, screen):
+        self.number = number
+        self.name = f":{number}"
+        self.screen = screen  # 宽x高x色深，如1920x1080x24
+        self.process = None
+
+    @staticmethod
+    def isFree(number):
+        return not os.path.exists(f"/tmp/.X{number}-lock") and not os.path.exists(f"/tmp/.X11-unix/X{number}")
+
+    def start(self):
+        self.process = subprocess.Popen(
+            ["Xvfb", self.name, "-screen", "0", self.screen, "-nolisten", "tcp", "-ac"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + XVFB_START_TIMEOUT
+        while not os.path.exists(f"/tmp/.X11-unix/X{self.number}"):
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"Xvfb {self.name} 启动失败")
+            time.sleep(0.05)
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+
+def startDisplays(count, first_number, screen):
+    displays = []
+    number = first_number
+    try:
+        while len(displays) < count:
+            if CXvfbDisplay.isFree(number):
+                display = CXvfbDisplay(number, screen)
+                display.start()
+                displays.append(display)
+            number += 1
+    except Exception:
+        for display in displays:
+            display.stop()
+        raise
+    return displays
+
+
+def displayWorker(display, args, task_queue, result_queue):
+    # 每个显示一个独立进程：DISPLAY、被测程序、截图与输入后端都绑定到该显示
+    os.environ["DISPLAY"] = display
+    app = None
+    try:
+        from case_runner import CCaseRunner
+        from input_backend import createInputBackend
+        from playback_scheduler import latenessMessage
+        from screen_capture import createCaptureBackend
+        from screenshot_store import STORE_DIR, CScreenshotStore
+        from target_wait import timeoutMessage
+        if args.app:
+            app = subprocess.Popen(shlex.split(args.app), env=dict(os.environ))
+        store = CScreenshotStore(os.path.join(os.path.dirname(args.record_dir), STORE_DIR), args.compression)
+        runner = CCaseRunner(args.record_dir, args.playback_dir, createCaptureBackend(args.capture, display),
+                             createInputBackend(args.input, display), args.save, store)
+        runner.speed, runner.max_idle = args.speed, args.max_idle
+        runner.wait_target, runner.target_wait.timeout = args.wait_target, args.target_timeout
+    except Exception:
+        result_queue.put((display, None, None, None, traceback.format_exc()))
+        return
+    try:
+        while True:
+            case_dir = task_queue.get()
+            if case_dir is None:
+                break
+            try:
+                if args.screenshot:
+                    checkpoints, report = runner.screenshot(case_dir)
+                    failed = 0
+                    message = latenessMessage(report)
+                else:
+                    result = runner.playback(case_dir)
+                    checkpoints, failed = result.checkpoints, result.failed
+                    message = latenessMessage(result.report) + timeoutMessage(result.target_timeouts)
+                result_queue.put((display, case_dir, checkpoints, failed, message))
+            except Exception:
+                result_queue.put((display, case_dir, None, None, traceback.format_exc()))
+    finally:
+        if app and app.poll() is None:
+            app.terminate()
+
+
+def main(argv=None):
+    parser = buildParser("MyLance多显示并行回放，每个Xvfb显示运行一个回放进程，从队列领取用例")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并行的Xvfb显示数量，默认CPU核数")
+    parser.add_argument("--screen", default="1920x1080x24", help="Xvfb屏幕参数，需与录制截图时的分辨率一致")
+    parser.add_argument("--first-display", type=int, default=99, help="从该编号起查找空闲显示")
+    parser.add_argument("--app", default=None, help="在每个显示上启动的被测程序命令")
+    args = parser.parse_args(argv)
+
+    displays = startDisplays(args.workers, args.first_display, args.screen)
+    workers = []
+    try:
+        # 主进程同样会导入pyautogui，先指向已启动的显示
+        os.environ["DISPLAY"] = displays[0].name
+        from case_catalog import CCaseCatalog
+        from case_runner import EXPECT_IMAGE_DIR, PLAYBACK_DIR, RECORD_DIR, discoverCases
+        args.record_dir = args.record_dir or RECORD_DIR
+        args.playback_dir = args.playback_dir or PLAYBACK_DIR
+        cases = discoverCases(args.record_dir, args.software, args.module, args.case)
+        if not cases:
+            print("未找到录制数据：" + args.record_dir)
+            return EXIT_ERROR
+        skipped = 0
+        runnable = []
+        for case_dir in cases:
+            if args.screenshot or os.path.exists(os.path.join(case_dir, EXPECT_IMAGE_DIR)):
+                runnable.append(case_dir)
+            else:
+                skipped += 1
+                print(f"{os.path.relpath(case_dir, args.record_dir)} 跳过：缺少预期截图")
+
+        # 回放结果只由主进程写入用例索引
+        catalog = CCaseCatalog(os.path.dirname(args.record_dir), args.record_dir, args.playback_dir)
+        context = multiprocessing.get_context("spawn")
+        task_queue = context.Queue()
+        result_queue = context.Queue()
+        for case_dir in runnable:
+            task_queue.put(case_dir)
+        for display in displays:
+            task_queue.put(None)
+            worker = context.Process(target=displayWorker, args=(display.name, args, task_queue, result_queue))
+            worker.start()
+            workers.append(worker)
+
+        passed = failed = errors = 0
+        finished = 0
+        while finished < len(runnable):
+            try:
+                display, case_dir, checkpoints, failed_steps, message = result_queue.get(timeout=1)
+            except queue.Empty:
+                # 全部回放进程已退出时，剩余用例计为异常
+                if not any(worker.is_alive() for worker in workers):
+                    errors += len(runnable) - finished
+                    break
+                continue
+            if case_dir is None:
+                # 该显示的回放进程初始化失败，其余显示继续领取用例
+                print(f"{display} 初始化失败\n{message}")
+                continue
+            finished += 1
+            prefix = f"[{finished}/{len(runnable)}] {display} {os.path.relpath(case_dir, args.record_dir)}"
+            if checkpoints is not None and args.screenshot:
+                catalog.refreshCase(case_dir)
+            elif checkpoints is not None:
+                catalog.recordResult(case_dir, checkpoints, failed_steps)
+            if checkpoints is None:
+                errors += 1
+                print(f"{prefix} 异常\n{message}")
+            elif args.screenshot and not checkpoints:
+                # 与batch_runner一致，没有截图步骤的用例计为跳过
+                skipped += 1
+                print(f"{prefix} 无有效鼠标输入")
+            elif failed_steps:
+                failed += 1
+                print(f"{prefix} 失败：{failed_steps}/{checkpoints}步，{message}")
+            else:
+                passed += 1
+                print(f"{prefix} 完成：{checkpoints}步，{message}")
+        print(f"共{len(cases)}个用例：通过{passed}，失败{failed}，跳过{skipped}，异常{errors}")
+        return exitCode(failed, skipped, errors)
+    finally:
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        for display in displays:
+            display.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtGui import QImage, QPixmap
+
+PIXMAP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CPixmapCache:
+    # 图片查看的解码缓存：预取在后台线程解码为QImage，界面线程转换为QPixmap后按LRU保存
+    def __init__(self, max_bytes=PIXMAP_CACHE_MAX_BYTES, max_workers=2):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()  # (路径, 修改时间, 文件大小) -> (QPixmap, 占用字节)
+        self.pending = {}  # (路径, 修改时间, 文件大小) -> 解码中的Future
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    @staticmethod
+    def fileKey(path):
+        # 回放会重写同名图片，按修改时间和大小区分
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def prefetch(self, paths):
+        # 只保留本次需要的预取任务，翻页较快时放弃已经用不到的解码
+        wanted = {}
+        for path in paths:
+            key = self.fileKey(path)
+            if key is None or key in self.entries:
+                continue
+            wanted[key] = self.pending.pop(key, None) or self.executor.submit(QImage, path)
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = wanted
+
+    def pixmap(self, path):
+        key = self.fileKey(path)
+        if key is None:
+            return QPixmap()
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry[0]
+        future = self.pending.pop(key, None)
+        image = future.result() if future is not None else QImage(path)
+        pixmap = QPixmap.fromImage(image)
+        size = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        self.entries[key] = (pixmap, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+        return pixmap
+
+    def clear(self):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def shutdown(self):
+        self.clear()
+        self.executor.shutdown(wait=False)
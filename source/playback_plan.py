@@ -0,0 +1,191 @@
+from collections import namedtuple
+from playback_scheduler import CPlaybackAborted, CPlaybackScheduler
+from recording_format import BUTTON_DOWN, BUTTON_UP, CEventType
+
+IDLE_GAP = 0.2  # 超过该间隔（秒）的停顿视为操作之间的空闲时间，可被压缩
+DOUBLE_CLICK_TIME = 0.5  # 录制时间隔超过该值的两次点击，加速后也不短于该值，避免被识别为双击
+RELEASE_EVENTS = dict(zip(BUTTON_DOWN + (CEventType.KEY_DOWN,), BUTTON_UP + (CEventType.KEY_UP,)))  # 按下 -> 松开
+
+# 回放步骤：行号、事件、坐标、按键名、操作间隔（秒）、之后是否截图比对、执行前是否等待画面稳定
+CPlaybackStep = namedtuple("CPlaybackStep", ["row", "event", "x", "y", "key", "delay", "checkpoint", "sync"],
+                           defaults=(False,))
+
+
+class CPlaybackPlan:
+    def __init__(self, steps):
+        self.steps = tuple(steps)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def checkpointRows(self):
+        return [step.row for step in self.steps if step.checkpoint]
+
+
+def compilePlan(recording, screenshot_list):
+    # screenshot_list为截图步骤号（行号+1）
+    checkpoints = set(screenshot_list)
+    keys = recording.keys
+    events = recording.events
+    steps = []
+    for row, (code, x, y, key, delay) in enumerate(zip(events["event"].tolist(), events["x"].tolist(),
+                                                      events["y"].tolist(), events["key"].tolist(),
+                                                      events["delay"].tolist())):
+        steps.append(CPlaybackStep(row, CEventType(code), x, y, keys[key] if key >= 0 else "",
+                                   delay / 1e6, row + 1 in checkpoints))
+    return CPlaybackPlan(steps)
+
+
+def markSync(plan, rows):
+    # 指定行号的步骤执行前调用on_sync
+    rows = set(rows)
+    return CPlaybackPlan(step._replace(sync=True) if step.row in rows else step for step in plan.steps)
+
+
+def acceleratePlan(plan, speed=1.0, max_idle=None):
+    # 只压缩没有按住鼠标键或键盘按键时超过IDLE_GAP的停顿，被压缩停顿后的第一个非移动事件标记sync
+    if speed <= 1.0 and max_idle is None:
+        return plan
+    held_buttons = 0
+    held_keys = set()
+    need_sync = False
+    source_time = target_time = 0.0
+    last_up_source = last_up_target = None
+    steps = []
+    for step in plan.steps:
+        source_time += step.delay
+        delay = step.delay
+        if not held_buttons and not held_keys and delay > IDLE_GAP:
+            delay = max(delay / speed, IDLE_GAP)
+            if max_idle is not None:
+                delay = min(delay, max(max_idle, IDLE_GAP))
+            need_sync = need_sync or delay < step.delay
+        if step.event in BUTTON_DOWN and last_up_source is not None \
+                and source_time - last_up_source >= DOUBLE_CLICK_TIME:
+            delay += max(0.0, DOUBLE_CLICK_TIME - (target_time + delay - last_up_target))
+        target_time += delay
+        sync = False
+        if step.event != CEventType.MOUSE_MOVE and need_sync:
+            sync = True
+            need_sync = False
+        if step.event in BUTTON_DOWN:
+            held_buttons += 1
+        elif step.event in BUTTON_UP:
+            held_buttons = max(0, held_buttons - 1)
+            last_up_source, last_up_target = source_time, target_time
+        elif step.event == CEventType.KEY_DOWN:
+            held_keys.add(step.key)
+        elif step.event == CEventType.KEY_UP:
+            held_keys.discard(step.key)
+        steps.append(step._replace(delay=delay, sync=sync))
+    return CPlaybackPlan(steps)
+
+
+class CPlaybackDispatcher:
+    def __init__(self, input_backend, on_checkpoint=None, on_sync=None, on_step=None, abort=None):
+        self.input = input_backend
+        self.on_checkpoint = on_checkpoint  # 截图步骤执行后的回调，参数为CPlaybackStep
+        self.on_sync = on_sync  # 加速回放时sync步骤执行前的同步等待回调
+        self.on_step = on_step  # 每步执行后的回调，参数为(步骤序号, CPlaybackStep)，用于报告进度
+        self.scheduler = CPlaybackScheduler(abort=abort)
+        self.handlers = {
+            CEventType.NONE: self.noneEvent,
+            CEventType.MOUSE_MOVE: self.mouseMove,
+            CEventType.MOUSE_LEFT_DOWN: self.mouseLeftDown,
+            CEventType.MOUSE_LEFT_UP: self.mouseLeftUp,
+            CEventType.MOUSE_RIGHT_DOWN: self.mouseRightDown,
+            CEventType.MOUSE_RIGHT_UP: self.mouseRightUp,
+            CEventType.MOUSE_MIDDLE_DOWN: self.mouseMiddleDown,
+            CEventType.MOUSE_MIDDLE_UP: self.mouseMiddleUp,
+            CEventType.MOUSE_WHEEL_UP: self.mouseWheelUp,
+            CEventType.MOUSE_WHEEL_DOWN: self.mouseWheelDown,
+            CEventType.KEY_DOWN: self.keyDown,
+            CEventType.KEY_UP: self.keyUp,
+        }
+
+    @staticmethod
+    def noneEvent(step):
+        pass
+
+    def mouseMove(self, step):
+        self.input.move(step.x, step.y)
+
+    def mouseLeftDown(self, step):
+        self.input.move(step.x, step.y)
+        self.input.buttonDown("left")
+
+    def mouseLeftUp(self, step):
+        self.input.buttonUp("left")
+
+    def mouseRightDown(self, step):
+        self.input.move(step.x, step.y)
+        self.input.buttonDown("right")
+
+    def mouseRightUp(self, step):
+        self.input.buttonUp("right")
+
+    def mouseMiddleDown(self, step):
+        self.input.move(step.x, step.y)
+        self.input.buttonDown("middle")
+
+    def mouseMiddleUp(self, step):
+        self.input.buttonUp("middle")
+
+    def mouseWheelUp(self, step):
+        self.input.move(step.x, step.y)
+        self.input.scroll(1)
+
+    def mouseWheelDown(self, step):
+        self.input.move(step.x, step.y)
+        self.input.scroll(-1)
+
+    def keyDown(self, step):
+        self.input.keyDown(step.key)
+
+    def keyUp(self, step):
+        self.input.keyUp(step.key)
+
+    def releaseHeld(self, steps):
+        # 中止时松开已执行步骤中按下后尚未松开的鼠标键和按键
+        held = {}
+        for step in steps:
+            if step.event in RELEASE_EVENTS:
+                held[(RELEASE_EVENTS[step.event], step.key)] = step
+            else:
+                held.pop((step.event, step.key), None)
+        for (event, _), step in held.items():
+            self.handlers[event](step)
+
+    def run(self, plan):
+        handlers = self.handlers
+        on_checkpoint = self.on_checkpoint
+        on_sync = self.on_sync
+        on_step = self.on_step
+        scheduler = self.scheduler
+        steps = plan.steps
+        last_index = len(steps) - 1
+        index = 0
+        scheduler.start()
+        try:
+            for index, step in enumerate(steps):
+                scheduler.wait(step.delay)
+                # 已落后于下一次移动的时刻时合并连续的鼠标移动，只注入最后的位置
+                if (step.event == CEventType.MOUSE_MOVE and index < last_index
+                        and steps[index + 1].event == CEventType.MOUSE_MOVE
+                        and scheduler.overdue(steps[index + 1].delay)):
+                    continue
+                if step.sync and on_sync:
+                    scheduler.pause()
+                    on_sync(step)
+                    scheduler.resume()
+                handlers[step.event](step)
+                if step.checkpoint and on_checkpoint:
+                    scheduler.pause()
+                    on_checkpoint(step)
+                    scheduler.resume()
+                if on_step:
+                    on_step(index, step)
+        except CPlaybackAborted:
+            self.releaseHeld(steps[:index])
+            raise
+        return scheduler.report()
@@ -0,0 +1,87 @@
+import sys
+import time
+from collections import namedtuple
+
+# Windows下time.sleep精度约15ms，需留出更长的自旋等待区间
+SPIN_THRESHOLD = 0.02 if sys.platform == 'win32' else 0.002
+
+# 回放速度：(空闲时间缩放倍数, 空闲时间上限秒数)，放在本模块使主界面启动时不必加载录制数据相关依赖
+PLAYBACK_SPEEDS = {
+    "原速": (1.0, None),
+    "2倍速": (2.0, None),
+    "4倍速": (4.0, None),
+    "跳过空闲": (1.0, 0.5),
+}
+
+# 回放延迟统计（秒）：事件数、平均、中位数、95分位、最大延迟
+CLatenessReport = namedtuple("CLatenessReport", ["count", "mean", "median", "p95", "max"])
+
+
+class CPlaybackAborted(Exception):
+    # 回放或录制截图被用户中止
+    pass
+
+
+def abortableSleep(seconds, abort=None):
+    # abort为threading.Event，已置位或等待期间置位时抛出CPlaybackAborted
+    if abort is None:
+        time.sleep(seconds)
+    elif abort.wait(seconds):
+        raise CPlaybackAborted()
+
+
+class CPlaybackScheduler:
+    def __init__(self, spin_threshold=SPIN_THRESHOLD, abort=None):
+        self.spin_threshold = spin_threshold
+        self.abort = abort  # threading.Event，置位后在下一次等待时中止
+        self.origin = None  # 时间轴零点（perf_counter）
+        self.target = 0.0  # 当前事件在录制时间轴上的绝对时间
+        self.pause_start = None
+        self.lateness = []
+
+    def start(self):
+        self.target = 0.0
+        self.lateness = []
+        self.origin = time.perf_counter()
+
+    def wait(self, delay):
+        # 按录制时间戳累加得到绝对时刻，避免逐步sleep的误差累积
+        self.target += delay
+        deadline = self.origin + self.target
+        remaining = deadline - time.perf_counter()
+        if self.abort is None:
+            if remaining > self.spin_threshold:
+                time.sleep(remaining - self.spin_threshold)
+        elif self.abort.is_set() or (remaining > self.spin_threshold
+                                     and self.abort.wait(remaining - self.spin_threshold)):
+            # 长时间空闲期间也能立即响应中止
+            raise CPlaybackAborted()
+        now = time.perf_counter()
+        while now < deadline:
+            now = time.perf_counter()
+        self.lateness.append(now - deadline)
+
+    def overdue(self, delay):
+        # 下一事件（间隔delay）的时刻是否已经过去
+        return time.perf_counter() >= self.origin + self.target + delay
+
+    def pause(self):
+        # 截图比对等非录制操作期间暂停时间轴
+        self.pause_start = time.perf_counter()
+
+    def resume(self):
+        self.origin += time.perf_counter() - self.pause_start
+        self.pause_start = None
+
+    def report(self):
+        if not self.lateness:
+            return CLatenessReport(0, 0.0, 0.0, 0.0, 0.0)
+        values = sorted(self.lateness)
+        count = len(values)
+        return CLatenessReport(count, sum(values) / count, values[count // 2],
+                               values[min(count - 1, int(count * 0.95))], values[-1])
+
+
+def latenessMessage(report):
+    return "事件数：{}，平均延迟：{:.2f}ms，95%延迟：{:.2f}ms，最大延迟：{:.2f}ms".format(
+        report.count, report.mean * 1000, report.p95 * 1000, report.max * 1000)
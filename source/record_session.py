@@ -0,0 +1,89 @@
+import csv
+import threading
+import time
+from mouse_path import CMoveSampler
+from recording_format import BUTTON_DOWN, BUTTON_UP, EVENT_CODES, RECORD_HEADER, CRecording, recordingPath
+
+
+class CRecordSession:
+    def __init__(self, csv_path, flush_interval=0.5, batch_size=256):
+        self.csv_path = csv_path
+        self.flush_interval = flush_interval  # 写线程最长刷新间隔（秒）
+        self.batch_size = batch_size  # 缓冲事件达到该数量时立即刷新
+        self.buffer = []
+        self.history = []  # 全部事件，停止时写入二进制录制文件
+        self.lock = threading.Lock()
+        self.flush_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.writer_thread = None
+        self.last_ns = None
+        self.move_sampler = CMoveSampler()
+
+    def start(self):
+        with open(self.csv_path, mode='a', encoding='utf-8', newline='') as csv_file:
+            csv.writer(csv_file).writerow(RECORD_HEADER)
+        self.stop_event.clear()
+        self.last_ns = time.perf_counter_ns()
+        self.writer_thread = threading.Thread(target=self.writerLoop, daemon=True)
+        self.writer_thread.start()
+
+    def append(self, now_ns, category, event_type, input_data):
+        # 调用方需持有self.lock
+        delay_ns = now_ns - self.last_ns
+        self.last_ns = now_ns
+        self.buffer.append((delay_ns, category, event_type, input_data))
+        self.history.append(self.buffer[-1])
+        if len(self.buffer) >= self.batch_size:
+            self.flush_event.set()
+
+    def appendMoves(self, points):
+        # 调用方需持有self.lock
+        for point_x, point_y, point_ns in points:
+            self.append(point_ns, "Mouse", "mouse move", [point_x, point_y])
+
+    def pushMove(self, x, y):
+        # 鼠标移动经自适应采样后写入，保留点使用其采集时刻的时间戳
+        now_ns = time.perf_counter_ns()
+        with self.lock:
+            self.appendMoves(self.move_sampler.move(x, y, now_ns))
+
+    def push(self, category, event_type, input_data):
+        # 在采集时刻打时间戳，操作间隔不受写文件耗时影响
+        now_ns = time.perf_counter_ns()
+        with self.lock:
+            self.appendMoves(self.move_sampler.flush())
+            code = EVENT_CODES.get(event_type)
+            if code in BUTTON_DOWN:
+                self.move_sampler.press()
+            elif code in BUTTON_UP:
+                self.move_sampler.release()
+            self.append(now_ns, category, event_type, input_data)
+
+    def flush(self):
+        with self.lock:
+            events, self.buffer = self.buffer, []
+        if not events:
+            return
+        rows = [[delay_ns // 1000000, category, event_type, input_data, "", ""]
+                for delay_ns, category, event_type, input_data in events]
+        with open(self.csv_path, mode='a', encoding='utf-8', newline='') as csv_file:
+            csv.writer(csv_file).writerows(rows)
+
+    def writerLoop(self):
+        while not self.stop_event.is_set():
+            self.flush_event.wait(self.flush_interval)
+            self.flush_event.clear()
+            self.flush()
+        self.flush()
+
+    def stop(self):
+        # 停止写线程并保证缓冲区全部落盘，最后一个待定的移动点也需写入
+        with self.lock:
+            self.appendMoves(self.move_sampler.flush())
+        self.stop_event.set()
+        self.flush_event.set()
+        if self.writer_thread:
+            self.writer_thread.join()
+            self.writer_thread = None
+        self.flush()
+        CRecording.fromEvents(self.history).save(recordingPath(self.csv_path))
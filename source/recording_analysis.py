@@ -0,0 +1,56 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from recording_format import CHECKPOINT_DOWN, CHECKPOINT_UP, CEventType, EVENT_CODES
+
+CHECKPOINT_GAP = 200000  # 抬起后超过该间隔（微秒）才按下，视为两次独立点击
+STATUS_NOT_RUN = 0
+STATUS_PASSED = 1
+STATUS_FAILED = 2
+
+# 用例分析结果：截图步骤号（行号+1）、用例状态、失败步骤数
+CRecordingAnalysis = namedtuple("CRecordingAnalysis", ["checkpoints", "status", "failed"])
+
+
+def checkpointMask(events, delays):
+    # 鼠标左/右键抬起后，下一步不是鼠标按下或间隔超过CHECKPOINT_GAP时截图
+    # CSV中的间隔只精确到毫秒，二进制录制的微秒间隔先截断到毫秒，两者判定结果一致
+    events = np.asarray(events)
+    delays = np.asarray(delays) // 1000 * 1000
+    mask = np.isin(events, CHECKPOINT_UP)
+    next_click = np.zeros(mask.shape, dtype=bool)
+    next_click[:-1] = np.isin(events[1:], CHECKPOINT_DOWN) & (delays[1:] <= CHECKPOINT_GAP)
+    return mask & ~next_click
+
+
+def checkpointSteps(mask):
+    return (np.flatnonzero(mask) + 1).tolist()
+
+
+def recordingCheckpoints(recording):
+    return checkpointSteps(checkpointMask(recording.events["event"], recording.events["delay"]))
+
+
+def frameEvents(df):
+    # CSV中的事件类型和操作间隔（毫秒）转换为事件码和微秒
+    events = df.iloc[:, 2].astype(str).map(EVENT_CODES).fillna(CEventType.NONE).to_numpy(dtype=np.uint8)
+    delays = pd.to_numeric(df.iloc[:, 0], errors='coerce').fillna(0).to_numpy(dtype=np.int64) * 1000
+    return events, delays
+
+
+def caseStatus(results, mask):
+    # results为结果列，只统计截图步骤
+    step_results = np.asarray(results, dtype=object)[mask].astype(str)
+    failed = int(np.count_nonzero(step_results == "失败"))
+    if failed:
+        return STATUS_FAILED, failed
+    if np.any(step_results == "通过"):
+        return STATUS_PASSED, 0
+    return STATUS_NOT_RUN, 0
+
+
+def analyzeFrame(df):
+    mask = checkpointMask(*frameEvents(df))
+    status, failed = caseStatus(df.iloc[:, 5].to_numpy(dtype=object), mask)
+    # 分析结果保存在文件缓存中被多处共享，截图步骤用元组避免被修改
+    return CRecordingAnalysis(tuple(checkpointSteps(mask)), status, failed)
@@ -0,0 +1,95 @@
+import os
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+import numpy as np
+import pandas as pd
+from recording_analysis import analyzeFrame
+from recording_format import loadRecording
+
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# 用例CSV解析结果：数据表和截图步骤分析
+CCaseData = namedtuple("CCaseData", ["df", "analysis"])
+
+
+def valueSize(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(valueSize(item) for item in value)
+    if isinstance(value, dict):
+        # 比对区域、差异区域等按步骤号保存的字典
+        return sys.getsizeof(value) + sum(valueSize(key) + valueSize(item) for key, item in value.items())
+    if hasattr(value, "events"):
+        return valueSize(value.events) + valueSize(value.keys)
+    return sys.getsizeof(value)
+
+
+class CFileCache:
+    # 按(路径, 修改时间, 文件大小)缓存解析结果，超过内存上限时淘汰最久未使用的项
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()  # (类别, 路径) -> (文件标识, 值, 占用字节)
+        self.lock = threading.Lock()
+
+    def get(self, kind, path, loader):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return loader(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (kind, path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.entries.move_to_end(key)
+                return entry[1]
+            # 先释放旧值再加载，加载过程可能需要重写同一文件
+            self.discard(key)
+        value = loader(path)
+        size = valueSize(value)
+        with self.lock:
+            self.discard(key)
+            if size <= self.max_bytes:
+                self.entries[key] = (stamp, value, size)
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    self.discard(next(iter(self.entries)))
+        return value
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def invalidate(self, path):
+        # 删除用例时清除该目录下的全部缓存
+        prefix = path + os.sep
+        with self.lock:
+            for key in [key for key in self.entries if key[1] == path or key[1].startswith(prefix)]:
+                self.discard(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+
+file_cache = CFileCache()
+
+
+def readCaseData(csv_path):
+    # 返回的数据表为共享对象，修改前需copy
+    def loader(path):
+        df = pd.read_csv(path, encoding='utf8')
+        return CCaseData(df, analyzeFrame(df))
+    return file_cache.get("case", csv_path, loader)
+
+
+def readRecording(csv_path):
+    # 缓存项读入内存，不保留内存映射，淘汰时即释放
+    return file_cache.get("recording", csv_path, lambda path: loadRecording(path, mmap=False))
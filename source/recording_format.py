@@ -0,0 +1,207 @@
+import glob
+import json
+import os
+import struct
+import sys
+from enum import IntEnum
+import numpy as np
+import pandas as pd
+
+RECORD_HEADER = ["操作间隔", "按键类别", "事件类型", "输入数据", "相似度", "结果"]
+
+
+class CEventType(IntEnum):
+    NONE = 0
+    MOUSE_MOVE = 1
+    MOUSE_LEFT_DOWN = 2
+    MOUSE_LEFT_UP = 3
+    MOUSE_RIGHT_DOWN = 4
+    MOUSE_RIGHT_UP = 5
+    MOUSE_MIDDLE_DOWN = 6
+    MOUSE_MIDDLE_UP = 7
+    MOUSE_WHEEL_UP = 8
+    MOUSE_WHEEL_DOWN = 9
+    KEY_DOWN = 10
+    KEY_UP = 11
+
+
+# 鼠标按键的按下、松开事件
+BUTTON_DOWN = (CEventType.MOUSE_LEFT_DOWN, CEventType.MOUSE_RIGHT_DOWN, CEventType.MOUSE_MIDDLE_DOWN)
+BUTTON_UP = (CEventType.MOUSE_LEFT_UP, CEventType.MOUSE_RIGHT_UP, CEventType.MOUSE_MIDDLE_UP)
+# 参与截图判定的按键事件，中键不截图
+CHECKPOINT_DOWN = (CEventType.MOUSE_LEFT_DOWN, CEventType.MOUSE_RIGHT_DOWN)
+CHECKPOINT_UP = (CEventType.MOUSE_LEFT_UP, CEventType.MOUSE_RIGHT_UP)
+
+
+EVENT_NAMES = {
+    CEventType.NONE: "nan",
+    CEventType.MOUSE_MOVE: "mouse move",
+    CEventType.MOUSE_LEFT_DOWN: "mouse left down",
+    CEventType.MOUSE_LEFT_UP: "mouse left up",
+    CEventType.MOUSE_RIGHT_DOWN: "mouse right down",
+    CEventType.MOUSE_RIGHT_UP: "mouse right up",
+    CEventType.MOUSE_MIDDLE_DOWN: "mouse middle down",
+    CEventType.MOUSE_MIDDLE_UP: "mouse middle up",
+    CEventType.MOUSE_WHEEL_UP: "mouse wheel up",
+    CEventType.MOUSE_WHEEL_DOWN: "mouse wheel down",
+    CEventType.KEY_DOWN: "key down",
+    CEventType.KEY_UP: "key up",
+}
+EVENT_CODES = {name: code for code, name in EVENT_NAMES.items()}
+
+# 定长列：事件码、坐标、按键表索引、操作间隔（微秒）
+RECORD_DTYPE = np.dtype([("event", "u1"), ("x", "<i4"), ("y", "<i4"), ("key", "<i4"), ("delay", "<i8")])
+RECORD_MAGIC = b"MYLANCE\0"
+RECORD_VERSION = 1
+RECORD_SUFFIX = ".rec"
+HEADER_STRUCT = struct.Struct("<8sIQI")
+
+
+def recordingPath(csv_path):
+    return os.path.splitext(csv_path)[0] + RECORD_SUFFIX
+
+
+class CRecording:
+    def __init__(self, events, keys):
+        self.events = events  # RECORD_DTYPE结构化数组，可为内存映射
+        self.keys = keys  # 按键名称表，events["key"]为其索引，-1表示无按键
+
+    def __len__(self):
+        return self.events.shape[0]
+
+    @classmethod
+    def fromEvents(cls, events):
+        # events为(间隔纳秒, 按键类别, 事件类型, 输入数据)元组列表
+        array = np.zeros(len(events), dtype=RECORD_DTYPE)
+        keys = []
+        key_index = {}
+        codes, xs, ys, key_codes, delays = [], [], [], [], []
+        for delay_ns, _, event_type, input_data in events:
+            code = EVENT_CODES.get(event_type, CEventType.NONE)
+            x, y, key = 0, 0, -1
+            if code >= CEventType.KEY_DOWN:
+                # pynput对部分按键（如小键盘）取不到名称，记为空字符串，回放时跳过
+                input_data = input_data or ""
+                if input_data not in key_index:
+                    key_index[input_data] = len(keys)
+                    keys.append(input_data)
+                key = key_index[input_data]
+            elif code != CEventType.NONE:
+                x, y = input_data
+            codes.append(code)
+            xs.append(x)
+            ys.append(y)
+            key_codes.append(key)
+            delays.append(delay_ns // 1000)
+        array["event"] = codes
+        array["x"] = xs
+        array["y"] = ys
+        array["key"] = key_codes
+        array["delay"] = delays
+        return cls(array, keys)
+
+    @classmethod
+    def fromDataFrame(cls, df):
+        event_names = df.iloc[:, 2].astype(str)
+        input_data = df.iloc[:, 3].fillna("").astype(str)  # 空按键名读入为NaN
+        array = np.zeros(df.shape[0], dtype=RECORD_DTYPE)
+        array["event"] = event_names.map(EVENT_CODES).fillna(CEventType.NONE).to_numpy(dtype=np.uint8)
+        array["delay"] = pd.to_numeric(df.iloc[:, 0], errors='coerce').fillna(0).to_numpy(dtype=np.int64) * 1000
+        coords = input_data.str.extract(r"\[(-?\d+), (-?\d+)\]")
+        array["x"] = pd.to_numeric(coords[0], errors='coerce').fillna(0).to_numpy(dtype=np.int32)
+        array["y"] = pd.to_numeric(coords[1], errors='coerce').fillna(0).to_numpy(dtype=np.int32)
+        is_key = array["event"] >= CEventType.KEY_DOWN
+        key_codes, keys = pd.factorize(input_data[is_key])
+        array["key"] = -1
+        array["key"][is_key] = key_codes
+        return cls(array, list(keys))
+
+    @classmethod
+    def fromCsv(cls, csv_path):
+        df = pd.read_csv(csv_path, encoding='utf8', dtype={RECORD_HEADER[3]: str}, keep_default_na=False)
+        return cls.fromDataFrame(df)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(path, 'rb') as f:
+            magic, version, count, keys_size = HEADER_STRUCT.unpack(f.read(HEADER_STRUCT.size))
+            if magic != RECORD_MAGIC or version != RECORD_VERSION:
+                raise ValueError(f"不支持的录制文件格式：{path}")
+            keys = json.loads(f.read(keys_size).decode('utf-8'))
+        offset = HEADER_STRUCT.size + keys_size
+        if count == 0:
+            return cls(np.zeros(0, dtype=RECORD_DTYPE), keys)
+        if mmap:
+            events = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=offset, shape=(count,))
+        else:
+            events = np.fromfile(path, dtype=RECORD_DTYPE, count=count, offset=offset)
+        return cls(events, keys)
+
+    def save(self, path):
+        keys_data = json.dumps(self.keys, ensure_ascii=False).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(HEADER_STRUCT.pack(RECORD_MAGIC, RECORD_VERSION, len(self), len(keys_data)))
+            f.write(keys_data)
+            f.write(np.ascontiguousarray(self.events, dtype=RECORD_DTYPE).tobytes())
+
+    def eventNames(self):
+        names = np.array([EVENT_NAMES[code] for code in CEventType], dtype=object)
+        return names[self.events["event"]]
+
+    def inputData(self):
+        data = np.full(len(self), "", dtype=object)
+        codes = self.events["event"]
+        is_key = codes >= CEventType.KEY_DOWN
+        is_mouse = (codes != CEventType.NONE) & ~is_key
+        if self.keys:
+            data[is_key] = np.array(self.keys, dtype=object)[self.events["key"][is_key]]
+        data[is_mouse] = [f"[{x}, {y}]" for x, y in zip(self.events["x"][is_mouse], self.events["y"][is_mouse])]
+        return data
+
+    def toDataFrame(self):
+        codes = self.events["event"]
+        category = np.where(codes >= CEventType.KEY_DOWN, "Keyboard", "Mouse").astype(object)
+        category[codes == CEventType.NONE] = ""
+        return pd.DataFrame({
+            RECORD_HEADER[0]: self.events["delay"] // 1000,
+            RECORD_HEADER[1]: category,
+            RECORD_HEADER[2]: self.eventNames(),
+            RECORD_HEADER[3]: self.inputData(),
+            RECORD_HEADER[4]: np.nan,
+            RECORD_HEADER[5]: np.nan,
+        })
+
+    def toCsv(self, csv_path):
+        self.toDataFrame().to_csv(csv_path, index=False, encoding='utf-8')
+
+
+def loadRecording(csv_path, mmap=True):
+    # 二进制文件不旧于CSV时直接加载，否则解析CSV并补写二进制文件
+    # 长期持有的录制数据需传mmap=False，内存映射会一直占用文件句柄，Windows下还会锁定文件
+    rec_path = recordingPath(csv_path)
+    if os.path.exists(rec_path) and os.path.getmtime(rec_path) >= os.path.getmtime(csv_path):
+        return CRecording.load(rec_path, mmap)
+    recording = CRecording.fromCsv(csv_path)
+    recording.save(rec_path)
+    return recording
+
+
+def convertRecordTree(record_dir, force=False):
+    # 录制数据目录结构：软件/模块/用例/用例标题.csv
+    converted = []
+    for csv_path in glob.glob(os.path.join(record_dir, "*", "*", "*", "*.csv")):
+        rec_path = recordingPath(csv_path)
+        if not force and os.path.exists(rec_path) and os.path.getmtime(rec_path) >= os.path.getmtime(csv_path):
+            continue
+        CRecording.fromCsv(csv_path).save(rec_path)
+        converted.append(rec_path)
+    return converted
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        target_dir = sys.argv[1]
+    else:
+        target_dir = os.path.join(os.path.expanduser("~"), "测试数据", "录制数据")
+    for path in convertRecordTree(target_dir):
+        print(path)
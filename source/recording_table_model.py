@@ -0,0 +1,57 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor
+
+STEP_BRUSHES = {
+    "nan": QBrush(QColor(0, 190, 225)),  # 截图步骤未回放
+    "通过": QBrush(QColor(0, 250, 26)),
+    "失败": QBrush(QColor(255, 39, 0)),
+}
+RESULT_COLUMN = 5
+
+
+class CRecordingTableModel(QAbstractTableModel):
+    # 按列保存录制数据，单元格文本和截图步骤颜色在显示时才计算
+    def __init__(self, parent=None):
+        super(CRecordingTableModel, self).__init__(parent)
+        self.headers = []
+        self.columns = []
+        self.row_count = 0
+        self.checkpoint_rows = frozenset()  # 行号（从0开始）
+
+    def setFrame(self, df, checkpoint_rows):
+        self.beginResetModel()
+        self.headers = [str(name) for name in df.columns]
+        self.columns = [df[name].to_numpy(dtype=object) for name in df.columns]
+        self.row_count = df.shape[0]
+        self.checkpoint_rows = frozenset(checkpoint_rows)
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.headers = []
+        self.columns = []
+        self.row_count = 0
+        self.checkpoint_rows = frozenset()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self.columns[index.column()][index.row()])
+        if role == Qt.BackgroundRole and index.row() in self.checkpoint_rows and len(self.columns) > RESULT_COLUMN:
+            return STEP_BRUSHES.get(str(self.columns[RESULT_COLUMN][index.row()]))
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        return str(section + 1)
@@ -0,0 +1,67 @@
+import sys
+import threading
+import numpy as np
+import pyautogui
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+
+class CPyautoguiCapture:
+    name = "pyautogui"
+
+    def __init__(self, display=None):
+        self.display = display
+
+    def size(self):
+        return tuple(pyautogui.size())
+
+    def grab(self, region=None):
+        # region为(left, top, width, height)，返回BGR通道顺序的数组，与cv2解码的图片一致
+        image = np.asarray(pyautogui.screenshot(region=tuple(region) if region else None))
+        return np.ascontiguousarray(image[..., 2::-1])
+
+
+class CMssCapture:
+    # Linux下mss走X11共享内存（XShmGetImage）截图，可直接指定Xvfb的DISPLAY
+    name = "mss"
+
+    def __init__(self, display=None):
+        self.display = display
+        self.local = threading.local()  # mss实例持有X连接，不能跨线程共享
+
+    def instance(self):
+        if not hasattr(self.local, "sct"):
+            if self.display and sys.platform.startswith("linux"):
+                self.local.sct = mss.mss(display=self.display)
+            else:
+                self.local.sct = mss.mss()
+        return self.local.sct
+
+    def size(self):
+        monitor = self.instance().monitors[1]
+        return monitor["width"], monitor["height"]
+
+    def grab(self, region=None):
+        sct = self.instance()
+        monitor = sct.monitors[1]
+        if region:
+            left, top, width, height = region
+            monitor = {"left": monitor["left"] + left, "top": monitor["top"] + top, "width": width, "height": height}
+        shot = sct.grab(monitor)
+        return np.ascontiguousarray(np.frombuffer(shot.bgra, dtype=np.uint8).reshape(
+            shot.height, shot.width, 4)[..., :3])
+
+
+CAPTURE_BACKENDS = {CPyautoguiCapture.name: CPyautoguiCapture, CMssCapture.name: CMssCapture}
+
+
+def createCaptureBackend(name=None, display=None):
+    # 未指定时优先使用mss，未安装则退回pyautogui
+    if name is None:
+        name = CMssCapture.name if mss is not None else CPyautoguiCapture.name
+    if name == CMssCapture.name and mss is None:
+        raise RuntimeError("截图后端mss未安装，请执行pip install mss")
+    return CAPTURE_BACKENDS[name](display)
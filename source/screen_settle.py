@@ -0,0 +1,68 @@
+import time
+import cv2
+import numpy as np
+from playback_scheduler import abortableSleep
+
+SETTLE_MAX_WAIT = 2.0  # 截图前最长等待（秒），超时后直接截图
+SETTLE_INTERVAL = 0.05  # 采样间隔（秒）
+SETTLE_STABLE_TIME = 0.15  # 观察到画面变化后，持续不变达到该时长（秒）视为画面稳定
+SETTLE_QUIET_TIME = 0.3  # 始终未观察到变化时，需持续不变该时长（秒），避免在界面响应前截图
+SETTLE_REGION_SIZE = 400  # 点击位置周围采样区域边长（像素）
+SETTLE_SCREEN_SCALE = 0.125  # 同时采样缩小后的全屏，捕捉采样区域外的变化（如弹窗）
+
+
+def clickRegion(x, y, screen_size, size=SETTLE_REGION_SIZE):
+    # 以点击位置为中心的采样区域(left, top, width, height)，超出屏幕部分裁掉
+    screen_width, screen_height = screen_size
+    left = min(max(x - size // 2, 0), max(screen_width - size, 0))
+    top = min(max(y - size // 2, 0), max(screen_height - size, 0))
+    return left, top, min(size, screen_width), min(size, screen_height)
+
+
+class CScreenSettle:
+    def __init__(self, grab, max_wait=SETTLE_MAX_WAIT, interval=SETTLE_INTERVAL, stable_time=SETTLE_STABLE_TIME,
+                 quiet_time=SETTLE_QUIET_TIME, screen_scale=SETTLE_SCREEN_SCALE, tolerance=0.0, abort=None):
+        self.max_wait = max_wait
+        self.interval = interval
+        self.stable_time = stable_time
+        self.quiet_time = quiet_time
+        self.screen_scale = screen_scale
+        self.tolerance = tolerance  # 允许变化的像素比例
+        self.grab = grab  # 截图函数，参数为区域，返回图像数组
+        self.abort = abort  # threading.Event，置位后在下一次采样间隔中止
+
+    def isSame(self, previous, frame):
+        if previous.shape != frame.shape:
+            return False
+        if self.tolerance <= 0:
+            return np.array_equal(previous, frame)
+        changed = np.any(previous != frame, axis=-1) if frame.ndim == 3 else previous != frame
+        return np.count_nonzero(changed) <= self.tolerance * changed.size
+
+    def sample(self, region):
+        # 截一次全屏：未指定区域时比较全屏原图，否则比较区域原图和缩小后的全屏
+        screen = self.grab(None)
+        if region is None:
+            return [screen]
+        left, top, width, height = region
+        thumbnail = cv2.resize(screen, None, fx=self.screen_scale, fy=self.screen_scale, interpolation=cv2.INTER_AREA)
+        return [screen[top:top + height, left:left + width], thumbnail]
+
+    def wait(self, region=None):
+        # 观察到变化后画面稳定，或始终无变化达到静默时长后返回，返回实际等待时间（秒）
+        start = time.perf_counter()
+        previous = None
+        changed = False
+        last_change = start
+        while True:
+            frames = self.sample(region)
+            now = time.perf_counter()
+            if previous is not None and not all(map(self.isSame, previous, frames)):
+                changed = True
+                last_change = now
+            previous = frames
+            elapsed = now - start
+            still = now - last_change
+            if (changed and still >= self.stable_time) or still >= self.quiet_time or elapsed >= self.max_wait:
+                return elapsed
+            abortableSleep(min(self.interval, max(self.max_wait - elapsed, 0)), self.abort)
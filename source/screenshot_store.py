@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import cv2
+import numpy as np
+
+STORE_DIR = "截图数据"  # 位于测试数据目录下
+STORE_INDEX = "store.json"  # 图片目录下，记录各图片对应的对象哈希
+PNG_COMPRESSION = 1  # 0~9，越大文件越小、写入越慢
+
+
+class CScreenshotStore:
+    # 截图按像素内容哈希只保存一份，用例图片目录中的N.png是指向对象的硬链接
+    def __init__(self, store_dir, compression=PNG_COMPRESSION):
+        self.store_dir = store_dir
+        self.compression = compression
+        self.lock = threading.Lock()
+        self.refs = {}  # 图片目录 -> {文件名: 哈希}，flush时写入索引
+        os.makedirs(store_dir, exist_ok=True)
+
+    @staticmethod
+    def digest(image):
+        hasher = hashlib.blake2b(str(image.shape).encode('ascii'), digest_size=16)
+        hasher.update(np.ascontiguousarray(image).data)
+        return hasher.hexdigest()
+
+    def objectPath(self, digest):
+        return os.path.join(self.store_dir, digest[:2], digest + ".png")
+
+    def put(self, path, image):
+        # 相同画面只编码一次，之后只需计算哈希并建立链接
+        digest = self.digest(image)
+        object_path = self.objectPath(digest)
+        if os.path.lexists(path):
+            os.remove(path)
+        while True:
+            if not os.path.exists(object_path):
+                self.writeObject(object_path, image)
+            try:
+                os.link(object_path, path)
+            except FileNotFoundError:
+                continue  # 对象刚被其他回放进程回收，重新写入
+            except OSError:
+                # 不支持硬链接（如跨磁盘）时退化为复制
+                shutil.copyfile(object_path, path)
+            break
+        with self.lock:
+            self.refs.setdefault(os.path.dirname(path), {})[os.path.basename(path)] = digest
+        return digest
+
+    def writeObject(self, object_path, image):
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        temp_path = f"{object_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        cv2.imencode(".png", image, [cv2.IMWRITE_PNG_COMPRESSION, self.compression])[1].tofile(temp_path)
+        os.replace(temp_path, object_path)
+
+    @staticmethod
+    def loadIndex(image_dir):
+        path = os.path.join(image_dir, STORE_INDEX)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def flush(self):
+        with self.lock:
+            refs, self.refs = self.refs, {}
+        for image_dir, names in refs.items():
+            if not os.path.isdir(image_dir):
+                continue
+            index = self.loadIndex(image_dir)
+            index.update(names)
+            with open(os.path.join(image_dir, STORE_INDEX), 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+
+    @staticmethod
+    def collectObject(object_path):
+        # 只剩对象自身一个链接时，已没有用例引用
+        try:
+            if os.stat(object_path).st_nlink <= 1:
+                os.remove(object_path)
+                return True
+        except FileNotFoundError:
+            pass
+        return False
+
+    def release(self, image_dir):
+        # 删除图片目录，并回收其中不再被其他用例引用的对象
+        digests = set(self.loadIndex(image_dir).values())
+        with self.lock:
+            self.refs.pop(image_dir, None)
+        if os.path.exists(image_dir):
+            shutil.rmtree(image_dir)
+        for digest in digests:
+            self.collectObject(self.objectPath(digest))
+
+    def collect(self):
+        # 全量回收，清理异常中断或手动删除目录后遗留的对象，返回删除的文件数
+        removed = 0
+        for bucket in os.scandir(self.store_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(".tmp"):
+                    os.remove(entry.path)
+                    removed += 1
+                elif self.collectObject(entry.path):
+                    removed += 1
+        return removed
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        target_dir = sys.argv[1]
+    else:
+        target_dir = os.path.join(os.path.expanduser("~"), "测试数据", STORE_DIR)
+    print(CScreenshotStore(target_dir).collect())
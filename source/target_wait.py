@@ -0,0 +1,68 @@
+import os
+import time
+import cv2
+import numpy as np
+from image_compare import readImage, toGray, writeImage
+from playback_scheduler import abortableSleep
+from screen_settle import clickRegion
+
+TARGET_DIR = "target"  # expect_image目录下，保存按下鼠标前点击位置周围的模板
+TARGET_SIZE = 48  # 模板边长（像素）
+TARGET_MARGIN = 64  # 回放时在模板位置四周扩展的搜索范围（像素）
+TARGET_THRESHOLD = 0.9  # 归一化相关系数达到该值视为找到目标
+TARGET_TIMEOUT = 10.0  # 等待目标出现的最长时间（秒），超时后照常点击
+TARGET_INTERVAL = 0.05  # 匹配间隔（秒）
+TARGET_MIN_STD = 4.0  # 灰度标准差低于该值的模板（纯色区域）无法区分，不保存
+
+
+def timeoutMessage(count):
+    return f"，等待点击目标超时{count}次" if count else ""
+
+
+class CTargetWait:
+    # 录制截图时保存点击目标模板，回放时等待目标出现在点击位置附近后再按下鼠标
+    def __init__(self, grab, size=TARGET_SIZE, margin=TARGET_MARGIN, threshold=TARGET_THRESHOLD,
+                 timeout=TARGET_TIMEOUT, interval=TARGET_INTERVAL, abort=None):
+        self.grab = grab  # 截图函数，参数为区域，返回图像数组
+        self.size = size
+        self.margin = margin
+        self.threshold = threshold
+        self.timeout = timeout
+        self.interval = interval
+        self.abort = abort  # threading.Event，置位后在下一次匹配间隔中止
+        self.templates = {}  # 步骤号 -> 灰度模板
+
+    def capture(self, step_name, x, y, screen_size, target_dir):
+        template = self.grab(clickRegion(x, y, screen_size, self.size))
+        if float(np.std(toGray(template))) < TARGET_MIN_STD:
+            return False
+        os.makedirs(target_dir, exist_ok=True)
+        writeImage(os.path.join(target_dir, f"{step_name}.png"), template)
+        return True
+
+    def load(self, target_dir):
+        self.templates = {}
+        if not os.path.isdir(target_dir):
+            return self.templates
+        for name in os.listdir(target_dir):
+            step_name, extension = os.path.splitext(name)
+            if extension == ".png" and step_name.isdigit():
+                self.templates[int(step_name)] = toGray(readImage(os.path.join(target_dir, name)))
+        return self.templates
+
+    def wait(self, step_name, x, y, screen_size):
+        # 找到目标立即返回True，超时返回False
+        template = self.templates.get(step_name)
+        if template is None:
+            return True
+        region = clickRegion(x, y, screen_size, self.size + 2 * self.margin)
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            frame = toGray(self.grab(region))
+            if frame.shape[0] >= template.shape[0] and frame.shape[1] >= template.shape[1]:
+                _, score, _, _ = cv2.minMaxLoc(cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED))
+                if score >= self.threshold:
+                    return True
+            if time.perf_counter() >= deadline:
+                return False
+            abortableSleep(self.interval, self.abort)
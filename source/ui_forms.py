@@ -0,0 +1,63 @@
+import hashlib
+import importlib
+import io
+import os
+from PyQt5.QtWidgets import QMainWindow, QWidget
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOURCE_DIR = os.path.join(os.path.dirname(SOURCE_DIR), "resource")  # 与工作目录无关
+FORM_MODULE_PREFIX = "ui_"  # pyuic5生成的界面模块名前缀，如ui_mainwindow.py
+
+# 界面文件名 -> 顶层控件类型
+UI_FORMS = {
+    "mainwindow": QMainWindow,
+    "instruction": QWidget,
+    "image": QWidget,
+}
+
+
+def resourcePath(*parts):
+    return os.path.join(RESOURCE_DIR, *parts)
+
+
+def uiDigest(ui_path):
+    # 忽略换行符差异，检出时转换CRLF不会使预编译模块失效
+    with open(ui_path, 'rb') as f:
+        return hashlib.blake2b(f.read().replace(b"\r\n", b"\n"), digest_size=16).hexdigest()
+
+
+def loadForm(name):
+    # 优先使用预编译的界面类，省去启动时解析XML；.ui修改后未重新生成时退回uic.loadUi
+    ui_path = os.path.join(SOURCE_DIR, name + ".ui")
+    try:
+        module = importlib.import_module(FORM_MODULE_PREFIX + name)
+    except ImportError:
+        module = None
+    if module is None or (os.path.exists(ui_path) and getattr(module, "UI_DIGEST", None) != uiDigest(ui_path)):
+        from PyQt5 import uic
+        return uic.loadUi(ui_path)
+    ui_class = next(value for key, value in vars(module).items() if key.startswith("Ui_"))
+    # 与uic.loadUi一致，子控件作为顶层控件的属性访问
+    form_class = type(ui_class.__name__[3:], (UI_FORMS[name], ui_class), {})
+    form = form_class()
+    form.setupUi(form)
+    return form
+
+
+def compileForms():
+    # 修改.ui后执行python ui_forms.py重新生成界面模块
+    from PyQt5 import uic
+    for name in UI_FORMS:
+        ui_path = os.path.join(SOURCE_DIR, name + ".ui")
+        with open(ui_path, 'rb') as f:
+            ui_file = io.BytesIO(f.read())
+        ui_file.name = name + ".ui"  # 生成的注释中只记录文件名，不记录本机绝对路径
+        # 生成的模块与其他源文件一致使用CRLF换行
+        form_path = os.path.join(SOURCE_DIR, FORM_MODULE_PREFIX + name + ".py")
+        with open(form_path, 'w', encoding='utf-8', newline='\r\n') as f:
+            uic.compileUi(ui_file, f)
+            f.write(f"\n\nUI_DIGEST = \"{uiDigest(ui_path)}\"\n")
+
+
+if __name__ == '__main__':
+    compileForms()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'image.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_imageComparison(object):
+    def setupUi(self, imageComparison):
+        imageComparison.setObjectName("imageComparison")
+        imageComparison.resize(1536, 864)
+        imageComparison.setMinimumSize(QtCore.QSize(1536, 864))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        imageComparison.setFont(font)
+        self.gridLayout = QtWidgets.QGridLayout(imageComparison)
+        self.gridLayout.setObjectName("gridLayout")
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.informationLayout = QtWidgets.QHBoxLayout()
+        self.informationLayout.setObjectName("informationLayout")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.informationLayout.addItem(spacerItem)
+        self.expect = QtWidgets.QLabel(imageComparison)
+        self.expect.setMaximumSize(QtCore.QSize(16777215, 30))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.expect.setFont(font)
+        self.expect.setObjectName("expect")
+        self.informationLayout.addWidget(self.expect)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.informationLayout.addItem(spacerItem1)
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.informationLayout.addItem(spacerItem2)
+        self.runtime = QtWidgets.QLabel(imageComparison)
+        self.runtime.setMaximumSize(QtCore.QSize(16777215, 30))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.runtime.setFont(font)
+        self.runtime.setObjectName("runtime")
+        self.informationLayout.addWidget(self.runtime)
+        spacerItem3 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.informationLayout.addItem(spacerItem3)
+        self.verticalLayout.addLayout(self.informationLayout)
+        self.graphicsFrame = QtWidgets.QFrame(imageComparison)
+        self.graphicsFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.graphicsFrame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.graphicsFrame.setObjectName("graphicsFrame")
+        self.verticalLayout.addWidget(self.graphicsFrame)
+        self.controlLayout = QtWidgets.QHBoxLayout()
+        self.controlLayout.setObjectName("controlLayout")
+        self.preBtn = QtWidgets.QPushButton(imageComparison)
+        self.preBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        self.preBtn.setObjectName("preBtn")
+        self.controlLayout.addWidget(self.preBtn)
+        self.nextBtn = QtWidgets.QPushButton(imageComparison)
+        self.nextBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        self.nextBtn.setObjectName("nextBtn")
+        self.controlLayout.addWidget(self.nextBtn)
+        self.regionBtn = QtWidgets.QPushButton(imageComparison)
+        self.regionBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        self.regionBtn.setObjectName("regionBtn")
+        self.controlLayout.addWidget(self.regionBtn)
+        self.ignoreBtn = QtWidgets.QPushButton(imageComparison)
+        self.ignoreBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        self.ignoreBtn.setObjectName("ignoreBtn")
+        self.controlLayout.addWidget(self.ignoreBtn)
+        self.clearRegionBtn = QtWidgets.QPushButton(imageComparison)
+        self.clearRegionBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        self.clearRegionBtn.setObjectName("clearRegionBtn")
+        self.controlLayout.addWidget(self.clearRegionBtn)
+        self.caseRegionCheck = QtWidgets.QCheckBox(imageComparison)
+        self.caseRegionCheck.setObjectName("caseRegionCheck")
+        self.controlLayout.addWidget(self.caseRegionCheck)
+        self.diffCheck = QtWidgets.QCheckBox(imageComparison)
+        self.diffCheck.setChecked(True)
+        self.diffCheck.setObjectName("diffCheck")
+        self.controlLayout.addWidget(self.diffCheck)
+        self.verticalLayout.addLayout(self.controlLayout)
+        self.gridLayout.addLayout(self.verticalLayout, 0, 0, 1, 1)
+
+        self.retranslateUi(imageComparison)
+        QtCore.QMetaObject.connectSlotsByName(imageComparison)
+
+    def retranslateUi(self, imageComparison):
+        _translate = QtCore.QCoreApplication.translate
+        imageComparison.setWindowTitle(_translate("imageComparison", "NotFound"))
+        self.expect.setText(_translate("imageComparison", "预期结果图片"))
+        self.runtime.setText(_translate("imageComparison", "运行结果图片"))
+        self.preBtn.setText(_translate("imageComparison", "上一步"))
+        self.nextBtn.setText(_translate("imageComparison", "下一步"))
+        self.regionBtn.setText(_translate("imageComparison", "设置比对区域"))
+        self.ignoreBtn.setText(_translate("imageComparison", "添加忽略区域"))
+        self.clearRegionBtn.setText(_translate("imageComparison", "清除区域"))
+        self.caseRegionCheck.setText(_translate("imageComparison", "应用到整个用例"))
+        self.diffCheck.setText(_translate("imageComparison", "显示差异"))
+
+
+UI_DIGEST = "0c74a72b027d809ee6d3b87068fff62a"
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'instruction.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_instruction(object):
+    def setupUi(self, instruction):
+        instruction.setObjectName("instruction")
+        instruction.resize(540, 540)
+        instruction.setMinimumSize(QtCore.QSize(540, 540))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        instruction.setFont(font)
+        self.gridLayout = QtWidgets.QGridLayout(instruction)
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout.setSpacing(0)
+        self.gridLayout.setObjectName("gridLayout")
+        self.instructionBrowser = QtWidgets.QTextBrowser(instruction)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        self.instructionBrowser.setFont(font)
+        self.instructionBrowser.setStyleSheet("QTextBrowser{\n"
+"    background-color: rgb(239,239,239)\n"
+"}")
+        self.instructionBrowser.setObjectName("instructionBrowser")
+        self.gridLayout.addWidget(self.instructionBrowser, 0, 0, 1, 1)
+
+        self.retranslateUi(instruction)
+        QtCore.QMetaObject.connectSlotsByName(instruction)
+
+    def retranslateUi(self, instruction):
+        _translate = QtCore.QCoreApplication.translate
+        instruction.setWindowTitle(_translate("instruction", "使用说明"))
+
+
+UI_DIGEST = "1948edc4963ace227a398cab320d313b"
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'mainwindow.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_mainWindow(object):
+    def setupUi(self, mainWindow):
+        mainWindow.setObjectName("mainWindow")
+        mainWindow.resize(960, 540)
+        mainWindow.setMinimumSize(QtCore.QSize(960, 540))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        mainWindow.setFont(font)
+        mainWindow.setLayoutDirection(QtCore.Qt.LeftToRight)
+        self.centralWidget = QtWidgets.QWidget(mainWindow)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.centralWidget.setFont(font)
+        self.centralWidget.setObjectName("centralWidget")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.centralWidget)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.leftLayout = QtWidgets.QVBoxLayout()
+        self.leftLayout.setObjectName("leftLayout")
+        self.softwareNameSearch = QtWidgets.QComboBox(self.centralWidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.softwareNameSearch.sizePolicy().hasHeightForWidth())
+        self.softwareNameSearch.setSizePolicy(sizePolicy)
+        self.softwareNameSearch.setMinimumSize(QtCore.QSize(0, 0))
+        self.softwareNameSearch.setMaximumSize(QtCore.QSize(16777215, 30))
+        self.softwareNameSearch.setBaseSize(QtCore.QSize(0, 0))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.softwareNameSearch.setFont(font)
+        self.softwareNameSearch.setLayoutDirection(QtCore.Qt.LeftToRight)
+        self.softwareNameSearch.setAutoFillBackground(False)
+        self.softwareNameSearch.setStyleSheet("QCombopbox::view{ \n"
+"    position: absolute;\n"
+"    left: 1px;\n"
+"    top: 31px;\n"
+"}")
+        self.softwareNameSearch.setEditable(True)
+        self.softwareNameSearch.setCurrentText("")
+        self.softwareNameSearch.setMaxVisibleItems(18)
+        self.softwareNameSearch.setInsertPolicy(QtWidgets.QComboBox.NoInsert)
+        self.softwareNameSearch.setSizeAdjustPolicy(QtWidgets.QComboBox.AdjustToContents)
+        self.softwareNameSearch.setPlaceholderText("")
+        self.softwareNameSearch.setDuplicatesEnabled(False)
+        self.softwareNameSearch.setFrame(True)
+        self.softwareNameSearch.setObjectName("softwareNameSearch")
+        self.leftLayout.addWidget(self.softwareNameSearch)
+        self.tree = QtWidgets.QTreeWidget(self.centralWidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.tree.sizePolicy().hasHeightForWidth())
+        self.tree.setSizePolicy(sizePolicy)
+        self.tree.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.tree.setFont(font)
+        self.tree.setAutoFillBackground(False)
+        self.tree.setStyleSheet("QHeaderView::section {\n"
+"    background-color: rgb(240, 240, 240);\n"
+"}")
+        self.tree.setRootIsDecorated(True)
+        self.tree.setUniformRowHeights(False)
+        self.tree.setItemsExpandable(True)
+        self.tree.setAnimated(False)
+        self.tree.setAllColumnsShowFocus(False)
+        self.tree.setWordWrap(False)
+        self.tree.setHeaderHidden(False)
+        self.tree.setExpandsOnDoubleClick(True)
+        self.tree.setObjectName("tree")
+        self.tree.headerItem().setText(0, "软件录制信息")
+        self.tree.headerItem().setTextAlignment(0, QtCore.Qt.AlignCenter)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.tree.headerItem().setFont(0, font)
+        self.tree.header().setVisible(True)
+        self.tree.header().setCascadingSectionResizes(False)
+        self.tree.header().setHighlightSections(False)
+        self.tree.header().setSortIndicatorShown(True)
+        self.tree.header().setStretchLastSection(True)
+        self.leftLayout.addWidget(self.tree)
+        self.horizontalLayout.addLayout(self.leftLayout)
+        self.rightLayout = QtWidgets.QVBoxLayout()
+        self.rightLayout.setSizeConstraint(QtWidgets.QLayout.SetDefaultConstraint)
+        self.rightLayout.setObjectName("rightLayout")
+        self.editFrame = QtWidgets.QFrame(self.centralWidget)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.editFrame.setFont(font)
+        self.editFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.editFrame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.editFrame.setObjectName("editFrame")
+        self.gridLayout = QtWidgets.QGridLayout(self.editFrame)
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout.setObjectName("gridLayout")
+        self.softwareName = QtWidgets.QLabel(self.editFrame)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.softwareName.setFont(font)
+        self.softwareName.setObjectName("softwareName")
+        self.gridLayout.addWidget(self.softwareName, 0, 0, 1, 1)
+        self.softwareNameEdit = QtWidgets.QLineEdit(self.editFrame)
+        self.softwareNameEdit.setMaximumSize(QtCore.QSize(16777215, 30))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.softwareNameEdit.setFont(font)
+        self.softwareNameEdit.setObjectName("softwareNameEdit")
+        self.gridLayout.addWidget(self.softwareNameEdit, 0, 1, 1, 1)
+        self.caseNumber = QtWidgets.QLabel(self.editFrame)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.caseNumber.setFont(font)
+        self.caseNumber.setObjectName("caseNumber")
+        self.gridLayout.addWidget(self.caseNumber, 0, 2, 1, 1)
+        self.caseNumberEdit = QtWidgets.QLineEdit(self.editFrame)
+        self.caseNumberEdit.setMaximumSize(QtCore.QSize(16777215, 30))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.caseNumberEdit.setFont(font)
+        self.caseNumberEdit.setCursorMoveStyle(QtCore.Qt.LogicalMoveStyle)
+        self.caseNumberEdit.setObjectName("caseNumberEdit")
+        self.gridLayout.addWidget(self.caseNumberEdit, 0, 3, 1, 1)
+        self.moduleName = QtWidgets.QLabel(self.editFrame)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.moduleName.setFont(font)
+        self.moduleName.setObjectName("moduleName")
+        self.gridLayout.addWidget(self.moduleName, 1, 0, 1, 1)
+        self.moduleNameEdit = QtWidgets.QLineEdit(self.editFrame)
+        self.moduleNameEdit.setMaximumSize(QtCore.QSize(16777215, 30))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.moduleNameEdit.setFont(font)
+        self.moduleNameEdit.setStyleSheet("QToolTip{\n"
+"    border: 0px solid rgb(0,0,0);\n"
+"    background-color: rgb(255,255,220);\n"
+"}")
+        self.moduleNameEdit.setObjectName("moduleNameEdit")
+        self.gridLayout.addWidget(self.moduleNameEdit, 1, 1, 1, 1)
+        self.caseTitle = QtWidgets.QLabel(self.editFrame)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.caseTitle.setFont(font)
+        self.caseTitle.setObjectName("caseTitle")
+        self.gridLayout.addWidget(self.caseTitle, 1, 2, 1, 1)
+        self.caseTitleEdit = QtWidgets.QLineEdit(self.editFrame)
+        self.caseTitleEdit.setMaximumSize(QtCore.QSize(16777215, 30))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.caseTitleEdit.setFont(font)
+        self.caseTitleEdit.setObjectName("caseTitleEdit")
+        self.gridLayout.addWidget(self.caseTitleEdit, 1, 3, 1, 1)
+        self.rightLayout.addWidget(self.editFrame)
+        self.controlLayout = QtWidgets.QHBoxLayout()
+        self.controlLayout.setObjectName("controlLayout")
+        self.recordBtn = QtWidgets.QPushButton(self.centralWidget)
+        self.recordBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.recordBtn.setFont(font)
+        self.recordBtn.setStyleSheet("QPushButton{\n"
+"    background-color: rgb(240,240,240)\n"
+"}\n"
+"QToolTip{\n"
+"    border: 0px solid rgb(0,0,0); \n"
+"    background-color: rgb(255,255,220);\n"
+"}")
+        self.recordBtn.setCheckable(False)
+        self.recordBtn.setObjectName("recordBtn")
+        self.controlLayout.addWidget(self.recordBtn)
+        self.recordScreenshotBtn = QtWidgets.QPushButton(self.centralWidget)
+        self.recordScreenshotBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.recordScreenshotBtn.setFont(font)
+        self.recordScreenshotBtn.setStyleSheet("QPushButton{\n"
+"    background-color: rgb(240,240,240)\n"
+"}")
+        self.recordScreenshotBtn.setObjectName("recordScreenshotBtn")
+        self.controlLayout.addWidget(self.recordScreenshotBtn)
+        self.playbackBtn = QtWidgets.QPushButton(self.centralWidget)
+        self.playbackBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.playbackBtn.setFont(font)
+        self.playbackBtn.setStyleSheet("QPushButton{\n"
+"    background-color: rgb(240,240,240)\n"
+"}")
+        self.playbackBtn.setObjectName("playbackBtn")
+        self.controlLayout.addWidget(self.playbackBtn)
+        self.playbackSpeedCombo = QtWidgets.QComboBox(self.centralWidget)
+        self.playbackSpeedCombo.setMaximumSize(QtCore.QSize(16777215, 40))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.playbackSpeedCombo.setFont(font)
+        self.playbackSpeedCombo.setObjectName("playbackSpeedCombo")
+        self.controlLayout.addWidget(self.playbackSpeedCombo)
+        self.waitTargetCheck = QtWidgets.QCheckBox(self.centralWidget)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.waitTargetCheck.setFont(font)
+        self.waitTargetCheck.setObjectName("waitTargetCheck")
+        self.controlLayout.addWidget(self.waitTargetCheck)
+        self.deleteBtn = QtWidgets.QPushButton(self.centralWidget)
+        self.deleteBtn.setMaximumSize(QtCore.QSize(16777215, 40))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.deleteBtn.setFont(font)
+        self.deleteBtn.setStyleSheet("QPushButton{\n"
+"    background-color: rgb(240,240,240)\n"
+"}")
+        self.deleteBtn.setObjectName("deleteBtn")
+        self.controlLayout.addWidget(self.deleteBtn)
+        self.rightLayout.addLayout(self.controlLayout)
+        self.table = QtWidgets.QTableView(self.centralWidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.table.sizePolicy().hasHeightForWidth())
+        self.table.setSizePolicy(sizePolicy)
+        self.table.setMinimumSize(QtCore.QSize(0, 0))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.table.setFont(font)
+        self.table.setStyleSheet("QHeaderView::section{\n"
+"    background-color:rgb(240,240,240)\n"
+"}")
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setObjectName("table")
+        self.table.horizontalHeader().setDefaultSectionSize(90)
+        self.table.horizontalHeader().setMinimumSectionSize(30)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setDefaultSectionSize(30)
+        self.table.verticalHeader().setMinimumSectionSize(30)
+        self.rightLayout.addWidget(self.table)
+        self.horizontalLayout.addLayout(self.rightLayout)
+        self.horizontalLayout.setStretch(0, 1)
+        self.horizontalLayout.setStretch(1, 3)
+        mainWindow.setCentralWidget(self.centralWidget)
+        self.menuBar = QtWidgets.QMenuBar(mainWindow)
+        self.menuBar.setGeometry(QtCore.QRect(0, 0, 960, 26))
+        self.menuBar.setStyleSheet("QMenuBar{\n"
+"    background-color: rgb(239,239,239)\n"
+"}")
+        self.menuBar.setObjectName("menuBar")
+        self.help = QtWidgets.QMenu(self.menuBar)
+        self.help.setObjectName("help")
+        mainWindow.setMenuBar(self.menuBar)
+        self.statusBar = QtWidgets.QStatusBar(mainWindow)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.statusBar.setFont(font)
+        self.statusBar.setStyleSheet("QStatusBar{\n"
+"    background-color: rgb(239,239,239)\n"
+"}")
+        self.statusBar.setObjectName("statusBar")
+        mainWindow.setStatusBar(self.statusBar)
+        self.AllScripts = QtWidgets.QAction(mainWindow)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        self.AllScripts.setFont(font)
+        self.AllScripts.setObjectName("AllScripts")
+        self.CatalogPreprocessing = QtWidgets.QAction(mainWindow)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        self.CatalogPreprocessing.setFont(font)
+        self.CatalogPreprocessing.setObjectName("CatalogPreprocessing")
+        self.ImportFromTestCaseFile = QtWidgets.QAction(mainWindow)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        self.ImportFromTestCaseFile.setFont(font)
+        self.ImportFromTestCaseFile.setObjectName("ImportFromTestCaseFile")
+        self.ImportTestCaseFile = QtWidgets.QAction(mainWindow)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        self.ImportTestCaseFile.setFont(font)
+        self.ImportTestCaseFile.setObjectName("ImportTestCaseFile")
+        self.instruction = QtWidgets.QAction(mainWindow)
+        font = QtGui.QFont()
+        font.setFamily("Microsoft YaHei UI")
+        self.instruction.setFont(font)
+        self.instruction.setObjectName("instruction")
+        self.help.addAction(self.instruction)
+        self.menuBar.addAction(self.help.menuAction())
+
+        self.retranslateUi(mainWindow)
+        self.softwareNameSearch.setCurrentIndex(-1)
+        QtCore.QMetaObject.connectSlotsByName(mainWindow)
+
+    def retranslateUi(self, mainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        mainWindow.setWindowTitle(_translate("mainWindow", "MyLance"))
+        self.tree.setSortingEnabled(True)
+        self.softwareName.setText(_translate("mainWindow", "软件名称"))
+        self.softwareNameEdit.setPlaceholderText(_translate("mainWindow", "请输入测试软件名称"))
+        self.caseNumber.setText(_translate("mainWindow", "用例编号"))
+        self.caseNumberEdit.setPlaceholderText(_translate("mainWindow", "请输入测试用例编号"))
+        self.moduleName.setText(_translate("mainWindow", "模块名称"))
+        self.moduleNameEdit.setPlaceholderText(_translate("mainWindow", "请输入测试模块名称"))
+        self.caseTitle.setText(_translate("mainWindow", "用例标题"))
+        self.caseTitleEdit.setPlaceholderText(_translate("mainWindow", "请输入测试用例标题"))
+        self.recordBtn.setText(_translate("mainWindow", "开始录制"))
+        self.recordScreenshotBtn.setText(_translate("mainWindow", "录制截图"))
+        self.playbackBtn.setText(_translate("mainWindow", "开始回放"))
+        self.playbackSpeedCombo.setToolTip(_translate("mainWindow", "回放速度：只压缩操作之间的空闲时间，按键按住期间和点击过程保持录制时的节奏"))
+        self.waitTargetCheck.setToolTip(_translate("mainWindow", "回放时按下鼠标前等待录制截图时保存的点击目标出现在点击位置附近，出现后立即点击"))
+        self.waitTargetCheck.setText(_translate("mainWindow", "等待点击目标"))
+        self.deleteBtn.setText(_translate("mainWindow", "删除当前用例"))
+        self.help.setTitle(_translate("mainWindow", "帮助"))
+        self.AllScripts.setText(_translate("mainWindow", "生成所有项目脚本"))
+        self.CatalogPreprocessing.setText(_translate("mainWindow", "目录预处理"))
+        self.ImportFromTestCaseFile.setText(_translate("mainWindow", "从测试用例文件导入"))
+        self.ImportTestCaseFile.setText(_translate("mainWindow", "导入用例"))
+        self.instruction.setText(_translate("mainWindow", "使用说明"))
+
+
+UI_DIGEST = "a1356183c461250229fe8e072a042afd"
@@ -1,17 +1,62 @@
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QRectF, pyqtSignal
 from PyQt5.QtGui import QPainter
-from PyQt5.QtWidgets import QGraphicsView
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsPixmapItem, QGraphicsItem, QStyleOptionGraphicsItem
+
+PYRAMID_MIN_SIZE = 256  # 金字塔最小一级的长边（像素）
+
+
+class CPyramidPixmapItem(QGraphicsPixmapItem):
+    # 按当前缩放选择预先缩小的图片层级，只绘制视口露出的部分
+    def __init__(self, parent=None):
+        super(CPyramidPixmapItem, self).__init__(parent)
+        self.levels = []  # levels[n]为原图缩小2^n倍，按需生成
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setShapeMode(QGraphicsPixmapItem.BoundingRectShape)
+
+    def setPixmap(self, pixmap):
+        self.levels = [pixmap]
+        super(CPyramidPixmapItem, self).setPixmap(pixmap)
+
+    def level(self, index):
+        while len(self.levels) <= index:
+            previous = self.levels[-1]
+            if max(previous.width(), previous.height()) <= PYRAMID_MIN_SIZE:
+                return len(self.levels) - 1
+            self.levels.append(previous.scaled(max(previous.width() // 2, 1), max(previous.height() // 2, 1),
+                                               Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+        return index
+
+    def paint(self, painter, option, widget=None):
+        if not self.levels or self.levels[0].isNull():
+            return
+        detail = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        index = 0
+        while detail * (2 ** (index + 1)) <= 1.0:
+            index += 1
+        index = self.level(index)
+        pixmap = self.levels[index]
+        scale = 2 ** index
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        # 缩小显示时层级已平滑过，放大时按像素显示便于查看细节
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, detail * scale < 1.0)
+        source = QRectF((exposed.x() - self.offset().x()) / scale, (exposed.y() - self.offset().y()) / scale,
+                        exposed.width() / scale, exposed.height() / scale)
+        painter.drawPixmap(exposed, pixmap, source)
 
 
 class CZoomGraphicsView(QGraphicsView):
+    regionSelected = pyqtSignal(QRectF)
+
     def __init__(self, parent=None):
         super(CZoomGraphicsView, self).__init__(parent)
+        self.linked_views = []
+        self.syncing = False
         self.setRenderHint(QPainter.Antialiasing)
-        self.setRenderHint(QPainter.SmoothPixmapTransform)
         self.setRenderHint(QPainter.TextAntialiasing)
         self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
         self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setCacheMode(QGraphicsView.CacheBackground)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
@@ -25,3 +70,38 @@ class CZoomGraphicsView(QGraphicsView):
         if event.angleDelta().y() < 0:
             zoom_factor = 0.9
         self.scale(zoom_factor, zoom_factor)
+        self.syncLinkedViews()
+
+    def linkView(self, view):
+        # 两个视图同步缩放和平移
+        self.linked_views.append(view)
+        view.linked_views.append(self)
+        for source in (self, view):
+            source.horizontalScrollBar().valueChanged.connect(source.syncLinkedViews)
+            source.verticalScrollBar().valueChanged.connect(source.syncLinkedViews)
+
+    def syncLinkedViews(self):
+        if self.syncing:
+            return
+        center = self.mapToScene(self.viewport().rect().center())
+        for view in self.linked_views:
+            view.syncing = True
+            view.setTransform(self.transform())
+            view.centerOn(center)
+            view.syncing = False
+
+    def startRegionSelection(self):
+        # 框选一次区域后恢复拖拽模式
+        self.setDragMode(QGraphicsView.RubberBandDrag)
+        self.viewport().setCursor(Qt.CrossCursor)
+
+    def mouseReleaseEvent(self, event):
+        if self.dragMode() != QGraphicsView.RubberBandDrag:
+            super(CZoomGraphicsView, self).mouseReleaseEvent(event)
+            return
+        rect = self.mapToScene(self.rubberBandRect()).boundingRect()
+        super(CZoomGraphicsView, self).mouseReleaseEvent(event)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.viewport().unsetCursor()
+        if not rect.isEmpty():
+            self.regionSelected.emit(rect)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# source下的模块以脚本方式互相导入，测试时加入导入路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "source"))
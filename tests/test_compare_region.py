@@ -0,0 +1,28 @@
+import numpy as np
+from compare_region import CCompareRegion, cropRegion, maskIgnores
+
+
+def test_stepRegionOverridesCaseAndIgnoresAdd(tmp_path):
+    compare_region = CCompareRegion(str(tmp_path))
+    compare_region.setRegion([0, 0, 100, 100])
+    compare_region.addIgnore([1, 1, 5, 5])
+    compare_region.setRegion([10, 10, 50, 50], 3)
+    compare_region.addIgnore([20, 20, 5, 5], 3)
+    compare_region.save()
+    loaded = CCompareRegion(str(tmp_path))
+    assert loaded.region(3) == [10, 10, 50, 50]
+    assert loaded.region(4) == [0, 0, 100, 100]
+    assert loaded.ignores(3) == [[1, 1, 5, 5], [20, 20, 5, 5]]
+    loaded.clear(3)
+    assert loaded.region(3) == [0, 0, 100, 100]
+
+
+def test_cropAndMaskUseScreenCoordinates():
+    image = np.arange(100, dtype=np.uint8).reshape(10, 10)
+    cropped = cropRegion(image, [2, 3, 4, 5])
+    assert cropped.shape == (5, 4)
+    assert cropped[0, 0] == image[3, 2]
+    masked = maskIgnores(cropped, [[0, 0, 4, 5]], origin=(2, 3))
+    assert masked[:2, :2].tolist() == [[0, 0], [0, 0]]
+    assert masked[2, 2] == cropped[2, 2]
+    assert cropped[0, 0] == image[3, 2]  # 不修改原图
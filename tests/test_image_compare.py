@@ -0,0 +1,64 @@
+import numpy as np
+from image_compare import DIFF_DIR, SSIM_THRESHOLD, TIER_COARSE, TIER_EXACT, TIER_FULL, TIER_PIXEL, TIER_SIZE, \
+    CComparePool, compareImages, readImage
+
+
+def gradientImage(height=200, width=320):
+    row = np.linspace(0, 255, width).astype(np.uint8)
+    return np.dstack([np.tile(row, (height, 1))] * 3)
+
+
+def test_identicalImagesPassExactly():
+    image = gradientImage()
+    assert compareImages(image, image.copy()) == (1.0, TIER_EXACT, None)
+
+
+def test_sizeMismatchHasOwnTier():
+    assert compareImages(gradientImage(200, 320), gradientImage(200, 321)) == (0.0, TIER_SIZE, None)
+
+
+def test_clearlyDifferentImagesFailOnCoarseTier():
+    image = gradientImage()
+    ssim_value, tier, ssim_map = compareImages(image, 255 - image)
+    assert tier == TIER_COARSE
+    assert ssim_value < SSIM_THRESHOLD
+    assert ssim_map.shape == (50, 80)  # 缩略图尺寸
+
+
+def test_noiseSmoothedByDownscalingIsScoredAtFullResolution():
+    # 缩小后噪声被平均掉，缩略图相似度很高，但全分辨率下应判定失败
+    image = gradientImage()
+    noise = np.random.default_rng(0).integers(-2, 3, image.shape[:2])[..., None]
+    noisy = np.clip(image.astype(int) + noise, 0, 255).astype(np.uint8)
+    ssim_value, tier, ssim_map = compareImages(noisy, image)
+    assert tier == TIER_FULL
+    assert ssim_value < SSIM_THRESHOLD
+    assert ssim_map.shape == image.shape[:2]
+
+
+def test_regionSmallerThanSsimWindowIsComparedPixelByPixel():
+    image = gradientImage(5, 5)
+    changed = image.copy()
+    changed[2, 2] = 0
+    assert compareImages(image, image.copy()) == (1.0, TIER_EXACT, None)
+    ssim_value, tier, ssim_map = compareImages(changed, image)
+    assert (ssim_value, tier) == (0.0, TIER_PIXEL)
+    assert np.flatnonzero(ssim_map == 0).tolist() == [12]
+
+
+def test_saveDiffMarksChangedArea(tmp_path):
+    image = gradientImage()
+    changed = image.copy()
+    changed[100:140, 200:260] = 0
+    runtime_image_path = str(tmp_path / "3.png")
+    ssim_map = compareImages(changed, image)[2]
+    boxes = CComparePool.saveDiff(runtime_image_path, changed, image, ssim_map, (10, 20))
+    assert len(boxes) == 1
+    x, y, width, height = boxes[0]
+    assert x <= 210 and y <= 120 and x + width >= 270 and y + height >= 160
+    assert readImage(str(tmp_path / DIFF_DIR / "3.png")).shape[:2] == image.shape[:2]
+
+
+def test_saveDiffSizeMismatchMarksWholeImage(tmp_path):
+    boxes = CComparePool.saveDiff(str(tmp_path / "3.png"), gradientImage(20, 30), gradientImage(20, 31), None, (5, 6))
+    assert boxes == [[5, 6, 30, 20]]
@@ -0,0 +1,9 @@
+from input_backend import CStubInput, createInputBackend
+
+
+def test_stubBackendNeedsNoDisplay():
+    # 模块导入与stub后端都不依赖pyautogui、pynput
+    input_backend = createInputBackend(CStubInput.name)
+    input_backend.move(1, 2)
+    input_backend.keyDown("a")
+    assert input_backend.count == 2
@@ -0,0 +1,41 @@
+import os
+import pandas as pd
+import pytest
+from recording_format import RECORD_HEADER
+
+CASE_EVENTS = {
+    "c1": [["0", "Mouse", "mouse left down", "[1, 2]"], ["100", "Mouse", "mouse left up", "[1, 2]"]],
+    "c2": [["0", "Keyboard", "key down", "a"], ["100", "Keyboard", "key up", "a"]],
+}
+
+
+@pytest.fixture
+def mainWindow(tmp_path, monkeypatch):
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    # 主界面启动时不导入pynput，无显示时也可创建
+    from mainwindow import CMainWindow
+    module_dir = tmp_path / "测试数据" / "录制数据" / "软件" / "模块"
+    for case_number, rows in CASE_EVENTS.items():
+        case_dir = module_dir / case_number
+        case_dir.mkdir(parents=True)
+        pd.DataFrame([row + ["", ""] for row in rows], columns=RECORD_HEADER).to_csv(
+            str(case_dir / (case_number + ".csv")), index=False, encoding='utf8')
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = CMainWindow()
+    yield window, str(module_dir)
+    window.main_window.close()
+    app.processEvents()
+
+
+def test_switchCasesKeepsScreenshotList(mainWindow):
+    # 缓存中的截图步骤被共享，切换用例后再切回，截图步骤不应被清空
+    window, module_dir = mainWindow
+    c1, c2 = (window.tree_items[os.path.join(module_dir, name)] for name in ("c1", "c2"))
+    window.treeCurrentItemUpdate(c1)
+    assert window.screenshot_list == [2]
+    window.treeCurrentItemUpdate(c2)
+    assert window.screenshot_list == []
+    window.treeCurrentItemUpdate(c1)
+    assert window.screenshot_list == [2]
@@ -0,0 +1,77 @@
+import numpy as np
+from mouse_path import CMoveSampler, simplifyMask, simplifyRecording
+from recording_format import CRecording
+
+MS = 1000000  # 纳秒
+
+
+def sampleMoves(sampler, points):
+    kept = []
+    for x, y, now_ns in points:
+        kept.extend(sampler.move(x, y, now_ns))
+    return kept
+
+
+def test_straightLineKeepsEnds():
+    sampler = CMoveSampler()
+    points = [(step * 5, 0, step * 10 * MS) for step in range(20)]
+    kept = sampleMoves(sampler, points) + sampler.flush()
+    assert kept == [points[0], points[-1]]
+
+
+def test_turnKept():
+    sampler = CMoveSampler()
+    points = [(step * 5, 0, step * 10 * MS) for step in range(10)]
+    points += [(45, step * 5, (9 + step) * 10 * MS) for step in range(1, 10)]
+    kept = sampleMoves(sampler, points) + sampler.flush()
+    assert (45, 0, 90 * MS) in kept
+    assert kept[-1] == points[-1]
+
+
+def test_pauseKept():
+    sampler = CMoveSampler()
+    points = [(0, 0, 0), (5, 0, 10 * MS), (10, 0, 500 * MS), (15, 0, 510 * MS)]
+    kept = sampleMoves(sampler, points)
+    assert points[1] in kept
+
+
+def test_heldButtonKeepsAllMoves():
+    sampler = CMoveSampler()
+    sampler.press()
+    points = [(step, 0, step * MS) for step in range(10)]
+    assert sampleMoves(sampler, points) == points
+    sampler.release()
+    assert sampler.flush() == []
+
+
+def test_flushOnce():
+    sampler = CMoveSampler()
+    sampleMoves(sampler, [(0, 0, 0), (5, 0, 10 * MS)])
+    assert sampler.flush() == [(5, 0, 10 * MS)]
+    assert sampler.flush() == []
+
+
+def straightRecording(held=False):
+    events = [(0, "Mouse", "mouse left down", [0, 0])] if held else []
+    events += [(10 * MS, "Mouse", "mouse move", [step * 5, 0]) for step in range(20)]
+    events += [(10 * MS, "Mouse", "mouse left up" if held else "mouse left down", [95, 0])]
+    return CRecording.fromEvents(events)
+
+
+def test_simplifyMaskStraightLine():
+    recording = straightRecording()
+    keep = simplifyMask(recording)
+    assert np.flatnonzero(~keep).tolist() == list(range(1, 19))
+
+
+def test_simplifyMaskKeepsDrag():
+    assert simplifyMask(straightRecording(held=True)).all()
+
+
+def test_simplifyRecordingKeepsTimes():
+    recording = straightRecording()
+    keep = simplifyMask(recording)
+    simplified = simplifyRecording(recording, keep)
+    assert len(simplified) == 3
+    assert simplified.events["delay"].sum() == recording.events["delay"].sum()
+    assert simplified.events["delay"].tolist() == [10000, 190000, 10000]
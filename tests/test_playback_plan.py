@@ -0,0 +1,101 @@
+import pytest
+from playback_plan import DOUBLE_CLICK_TIME, IDLE_GAP, CPlaybackDispatcher, CPlaybackPlan, CPlaybackStep, \
+    acceleratePlan, compilePlan
+from recording_format import CEventType, CRecording
+
+EVENTS = [
+    (0, "Mouse", "mouse move", [10, 10]),
+    (1000000, "Mouse", "mouse left down", [20, 30]),
+    (1000000, "Mouse", "mouse left up", [20, 30]),
+    (1000000, "Keyboard", "key down", "a"),
+    (1000000, "Keyboard", "key up", "a"),
+    (1000000, "Mouse", "mouse wheel down", [40, 50]),
+]
+
+
+class CRecordInput:
+    # 记录注入调用，代替真实输入后端
+    def __init__(self):
+        self.calls = []
+
+    def move(self, x, y):
+        self.calls.append(("move", x, y))
+
+    def buttonDown(self, button):
+        self.calls.append(("buttonDown", button))
+
+    def buttonUp(self, button):
+        self.calls.append(("buttonUp", button))
+
+    def scroll(self, dy):
+        self.calls.append(("scroll", dy))
+
+    def keyDown(self, key):
+        self.calls.append(("keyDown", key))
+
+    def keyUp(self, key):
+        self.calls.append(("keyUp", key))
+
+
+def test_compilePlan():
+    plan = compilePlan(CRecording.fromEvents(EVENTS), [3])
+    assert len(plan) == len(EVENTS)
+    assert plan.steps[1].event == CEventType.MOUSE_LEFT_DOWN
+    assert (plan.steps[1].x, plan.steps[1].y) == (20, 30)
+    assert plan.steps[3].key == "a"
+    assert plan.steps[0].key == ""
+    assert plan.steps[1].delay == 0.001
+    assert plan.checkpointRows() == [2]
+
+
+def test_dispatcherInjectsEachStepAndCallsCheckpoint():
+    plan = compilePlan(CRecording.fromEvents(EVENTS), [3])
+    input_backend = CRecordInput()
+    checkpoints = []
+    CPlaybackDispatcher(input_backend, lambda step: checkpoints.append(step.row)).run(plan)
+    assert input_backend.calls == [
+        ("move", 10, 10), ("move", 20, 30), ("buttonDown", "left"), ("buttonUp", "left"),
+        ("keyDown", "a"), ("keyUp", "a"), ("move", 40, 50), ("scroll", -1),
+    ]
+    assert checkpoints == [2]
+
+
+def planSteps(*events):
+    # (事件, 间隔秒数[, 按键名])
+    return CPlaybackPlan(CPlaybackStep(row, event[0], 0, 0, event[2] if len(event) > 2 else "", event[1], False)
+                         for row, event in enumerate(events))
+
+
+def test_accelerateOriginalSpeedUnchanged():
+    plan = planSteps((CEventType.MOUSE_LEFT_DOWN, 5.0))
+    assert acceleratePlan(plan) is plan
+
+
+def test_accelerateCompressesIdleGaps():
+    plan = planSteps((CEventType.MOUSE_MOVE, 4.0), (CEventType.MOUSE_LEFT_DOWN, 0.1), (CEventType.MOUSE_LEFT_UP, 0.1),
+                     (CEventType.KEY_DOWN, 0.3, "a"))
+    steps = acceleratePlan(plan, 4.0).steps
+    assert [step.delay for step in steps] == [1.0, 0.1, 0.1, IDLE_GAP]
+    # 压缩后的第一个非移动事件前等待画面稳定
+    assert [step.sync for step in steps] == [False, True, False, True]
+
+
+def test_accelerateMaxIdle():
+    steps = acceleratePlan(planSteps((CEventType.MOUSE_LEFT_DOWN, 10.0)), max_idle=0.5).steps
+    assert steps[0].delay == 0.5
+
+
+def test_accelerateKeepsHeldGaps():
+    # 按住鼠标键或键盘按键期间的停顿属于操作本身，不压缩
+    plan = planSteps((CEventType.MOUSE_LEFT_DOWN, 0.0), (CEventType.MOUSE_MOVE, 3.0), (CEventType.MOUSE_LEFT_UP, 0.0),
+                     (CEventType.KEY_DOWN, 0.0, "ctrl"), (CEventType.MOUSE_LEFT_DOWN, 2.0),
+                     (CEventType.KEY_UP, 0.0, "ctrl"))
+    assert [step.delay for step in acceleratePlan(plan, 4.0).steps] == [0.0, 3.0, 0.0, 0.0, 2.0, 0.0]
+
+
+def test_accelerateAvoidsDoubleClick():
+    # 录制时不构成双击的两次点击，加速后间隔也不短于DOUBLE_CLICK_TIME
+    plan = planSteps((CEventType.MOUSE_LEFT_DOWN, 0.0), (CEventType.MOUSE_LEFT_UP, 0.05),
+                     (CEventType.MOUSE_LEFT_DOWN, 0.6), (CEventType.MOUSE_LEFT_UP, 0.05))
+    steps = acceleratePlan(plan, 4.0).steps
+    assert steps[2].delay == pytest.approx(DOUBLE_CLICK_TIME)
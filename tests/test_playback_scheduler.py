@@ -0,0 +1,56 @@
+import time
+import pytest
+from playback_scheduler import CLatenessReport, CPlaybackScheduler, latenessMessage
+
+
+def test_absoluteTimelineDoesNotDrift():
+    # 每步的执行耗时不累积到后续步骤
+    scheduler = CPlaybackScheduler()
+    scheduler.start()
+    for _ in range(50):
+        scheduler.wait(0.002)
+        time.sleep(0.001)
+    scheduler.wait(0.002)
+    elapsed = time.perf_counter() - scheduler.origin
+    assert elapsed == pytest.approx(0.102, abs=0.01)
+
+
+def test_latenessIsRecordedPerWait():
+    scheduler = CPlaybackScheduler()
+    scheduler.start()
+    for _ in range(10):
+        scheduler.wait(0.001)
+    report = scheduler.report()
+    assert report.count == 10
+    assert all(lateness >= 0 for lateness in scheduler.lateness)
+    assert report.max < 0.01
+
+
+def test_overrunStepIsLateOnlyOnce():
+    # 某一步耗时超出间隔后，下一步立即执行，之后的步骤重新准时
+    scheduler = CPlaybackScheduler()
+    scheduler.start()
+    scheduler.wait(0.001)
+    time.sleep(0.03)
+    scheduler.wait(0.01)
+    scheduler.wait(0.05)
+    assert scheduler.lateness[1] > 0.01
+    assert scheduler.lateness[2] < 0.01
+
+
+def test_pausedTimeIsExcluded():
+    scheduler = CPlaybackScheduler()
+    scheduler.start()
+    scheduler.pause()
+    time.sleep(0.05)
+    scheduler.resume()
+    scheduler.wait(0.01)
+    assert scheduler.lateness[0] < 0.01
+
+
+def test_report():
+    scheduler = CPlaybackScheduler()
+    assert scheduler.report() == CLatenessReport(0, 0.0, 0.0, 0.0, 0.0)
+    scheduler.lateness = [0.004, 0.001, 0.003, 0.002]
+    assert scheduler.report() == pytest.approx(CLatenessReport(4, 0.0025, 0.003, 0.004, 0.004))
+    assert latenessMessage(scheduler.report()) == "事件数：4，平均延迟：2.50ms，95%延迟：4.00ms，最大延迟：4.00ms"
@@ -0,0 +1,21 @@
+import pandas as pd
+from record_session import CRecordSession
+from recording_format import CEventType, loadRecording
+
+
+def test_stopWritesPendingMove(tmp_path):
+    # 停止录制前最后一次移动尚未决定是否保留，停止时也需写入
+    csv_path = str(tmp_path / "c1.csv")
+    session = CRecordSession(csv_path)
+    session.start()
+    session.push("Mouse", "mouse left down", [0, 0])
+    session.push("Mouse", "mouse left up", [0, 0])
+    for step in range(1, 6):
+        session.pushMove(step * 10, 0)
+    session.stop()
+    df = pd.read_csv(csv_path, encoding='utf8')
+    assert df.iloc[-1, 2] == "mouse move"
+    assert df.iloc[-1, 3] == "[50, 0]"
+    recording = loadRecording(csv_path)
+    assert recording.events["event"][-1] == CEventType.MOUSE_MOVE
+    assert (recording.events["x"][-1], recording.events["y"][-1]) == (50, 0)
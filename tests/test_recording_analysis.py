@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from recording_analysis import STATUS_FAILED, STATUS_NOT_RUN, STATUS_PASSED, analyzeFrame, recordingCheckpoints
+from recording_format import RECORD_HEADER, CRecording
+
+EVENT_CHOICES = ["mouse move", "mouse left down", "mouse left up", "mouse right down", "mouse right up",
+                 "mouse middle down", "mouse middle up", "mouse wheel up", "key down", "key up"]
+
+
+def oldCheckpoints(df):
+    # 原主界面逐行判定的截图步骤，作为向量化实现的对照
+    rows = df.shape[0]
+    checkpoints = []
+    passed = 0
+    for row in range(rows):
+        event = str(df.iloc[row, 2])
+        if event not in ("mouse left up", "mouse right up"):
+            continue
+        if row < rows - 1 and (str(df.iloc[row + 1, 2]) in ("mouse left down", "mouse right down")
+                               and not df.iloc[row + 1, 0] > 200):
+            continue
+        checkpoints.append(row + 1)
+        state = str(df.iloc[row, 5])
+        if state == "通过" and passed == 0:
+            passed = 1
+        elif state == "失败":
+            passed = 2
+    return checkpoints, passed
+
+
+def randomFrame(rng, rows):
+    events = rng.choice(EVENT_CHOICES, rows)
+    return pd.DataFrame({
+        RECORD_HEADER[0]: rng.integers(0, 400, rows),
+        RECORD_HEADER[1]: "Mouse",
+        RECORD_HEADER[2]: events,
+        RECORD_HEADER[3]: "[0, 0]",
+        RECORD_HEADER[4]: np.nan,
+        RECORD_HEADER[5]: rng.choice([np.nan, "通过", "失败"], rows, p=[0.4, 0.5, 0.1]),
+    })
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matchesRowByRowRule(seed):
+    df = randomFrame(np.random.default_rng(seed), 200)
+    checkpoints, passed = oldCheckpoints(df)
+    analysis = analyzeFrame(df)
+    assert list(analysis.checkpoints) == checkpoints
+    assert analysis.status == passed
+
+
+def test_gapBoundary():
+    # 间隔恰为200ms仍视为同一次连击，超过才截图；最后一步抬起总是截图
+    df = pd.DataFrame({
+        RECORD_HEADER[0]: [0, 0, 200, 0, 201, 0, 0],
+        RECORD_HEADER[1]: "Mouse",
+        RECORD_HEADER[2]: ["mouse left down", "mouse left up", "mouse left down", "mouse left up",
+                           "mouse right down", "mouse right up", "mouse move"],
+        RECORD_HEADER[3]: "[0, 0]",
+        RECORD_HEADER[4]: np.nan,
+        RECORD_HEADER[5]: np.nan,
+    })
+    assert list(analyzeFrame(df).checkpoints) == [4, 6]
+    assert analyzeFrame(df.iloc[:6]).checkpoints[-1] == 6
+
+
+def test_recordingAndCsvAgreeOnSubMillisecondGaps():
+    # 二进制录制保留微秒，CSV只有毫秒，200.6ms的间隔两者都视为200ms
+    events = [(0, "Mouse", "mouse left down", [1, 1]), (0, "Mouse", "mouse left up", [1, 1]),
+              (200600000, "Mouse", "mouse left down", [1, 1]), (1000000, "Mouse", "mouse left up", [1, 1])]
+    recording = CRecording.fromEvents(events)
+    assert list(recordingCheckpoints(recording)) == [4]
+    assert list(analyzeFrame(recording.toDataFrame()).checkpoints) == [4]
+
+
+def test_caseStatus():
+    df = CRecording.fromEvents([(0, "Mouse", "mouse left down", [1, 1]), (0, "Mouse", "mouse left up", [1, 1]),
+                                (0, "Mouse", "mouse move", [2, 2])]).toDataFrame()
+    assert analyzeFrame(df).status == STATUS_NOT_RUN
+    df[RECORD_HEADER[5]] = pd.Series([np.nan, "通过", "失败"], dtype=object)
+    assert analyzeFrame(df)[1:] == (STATUS_PASSED, 0)
+    df.iloc[1, 5] = "失败"
+    assert analyzeFrame(df)[1:] == (STATUS_FAILED, 1)
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from recording_cache import CFileCache, readCaseData, readRecording, valueSize
+from recording_format import RECORD_HEADER
+
+
+def writeFile(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def countingLoader(calls, size=100):
+    def loader(path):
+        calls.append(path)
+        return np.zeros(size, dtype=np.uint8)
+    return loader
+
+
+def test_cacheHit(tmp_path):
+    path = str(tmp_path / "a.csv")
+    writeFile(path, "1")
+    cache = CFileCache()
+    calls = []
+    first = cache.get("case", path, countingLoader(calls))
+    assert cache.get("case", path, countingLoader(calls)) is first
+    assert calls == [path]
+
+
+def test_changedFileReloaded(tmp_path):
+    path = str(tmp_path / "a.csv")
+    writeFile(path, "1")
+    cache = CFileCache()
+    calls = []
+    cache.get("case", path, countingLoader(calls))
+    writeFile(path, "22")
+    cache.get("case", path, countingLoader(calls))
+    assert calls == [path, path]
+    assert cache.total_bytes == 100
+
+
+def test_evictLeastRecentlyUsed(tmp_path):
+    paths = []
+    for name in "abc":
+        paths.append(str(tmp_path / name))
+        writeFile(paths[-1], name)
+    cache = CFileCache(max_bytes=250)
+    calls = []
+    cache.get("case", paths[0], countingLoader(calls))
+    cache.get("case", paths[1], countingLoader(calls))
+    cache.get("case", paths[0], countingLoader(calls))
+    cache.get("case", paths[2], countingLoader(calls))
+    assert [key[1] for key in cache.entries] == [paths[0], paths[2]]
+    assert cache.total_bytes == 200
+
+
+def test_oversizedValueNotCached(tmp_path):
+    path = str(tmp_path / "a")
+    writeFile(path, "a")
+    cache = CFileCache(max_bytes=50)
+    calls = []
+    cache.get("case", path, countingLoader(calls))
+    cache.get("case", path, countingLoader(calls))
+    assert len(calls) == 2
+    assert cache.total_bytes == 0
+
+
+def test_missingFileNotCached(tmp_path):
+    cache = CFileCache()
+    calls = []
+    cache.get("case", str(tmp_path / "none"), countingLoader(calls))
+    assert not cache.entries
+
+
+def test_invalidateDirectory(tmp_path):
+    case_dir = tmp_path / "c1"
+    case_dir.mkdir()
+    inside, outside = str(case_dir / "a.csv"), str(tmp_path / "c10")
+    writeFile(inside, "a")
+    writeFile(outside, "b")
+    cache = CFileCache()
+    cache.get("case", inside, countingLoader([]))
+    cache.get("case", outside, countingLoader([]))
+    cache.invalidate(str(case_dir))
+    assert [key[1] for key in cache.entries] == [outside]
+    assert cache.total_bytes == 100
+
+
+def test_valueSizeOfRegions():
+    # 比对区域、差异区域缓存为字典，应计入实际占用
+    regions = {str(step): [step, step, 100, 100] for step in range(100)}
+    assert valueSize(regions) > valueSize({})
+    assert valueSize({"1": [[0, 0, 10, 10]]}) > 0
+
+
+def test_readCaseData(tmp_path):
+    path = str(tmp_path / "c1.csv")
+    pd.DataFrame([
+        [0, "Mouse", "mouse left down", "[1, 2]", "", ""],
+        [100, "Mouse", "mouse left up", "[1, 2]", "", ""],
+    ], columns=RECORD_HEADER).to_csv(path, index=False, encoding='utf8')
+    case_data = readCaseData(path)
+    assert readCaseData(path) is case_data
+    assert case_data.analysis.checkpoints == (2,)
+
+
+def test_readRecordingNotMapped(tmp_path):
+    path = str(tmp_path / "c1.csv")
+    pd.DataFrame([[0, "Mouse", "mouse left down", "[1, 2]", "", ""]], columns=RECORD_HEADER).to_csv(
+        path, index=False, encoding='utf8')
+    recording = readRecording(path)
+    assert not isinstance(recording.events, np.memmap)
+    assert len(recording) == 1
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from recording_format import CEventType, CRecording, loadRecording, recordingPath
+
+EVENTS = [
+    (0, "Mouse", "mouse move", [10, 20]),
+    (1500000, "Mouse", "mouse left down", [10, 20]),
+    (2000000, "Mouse", "mouse left up", [-5, 30]),
+    (300000000, "Keyboard", "key down", "a"),
+    (1000000, "Keyboard", "key up", "a"),
+    (1000000, "Keyboard", "key down", "shift"),
+    (1000000, "Keyboard", "key up", "shift"),
+    (250000000, "Mouse", "mouse wheel down", [100, 200]),
+]
+
+
+def assertSameRecording(actual, expected):
+    assert actual.keys == expected.keys
+    assert np.array_equal(np.asarray(actual.events), np.asarray(expected.events))
+
+
+def test_fromEvents():
+    recording = CRecording.fromEvents(EVENTS)
+    assert len(recording) == len(EVENTS)
+    assert recording.events["event"][1] == CEventType.MOUSE_LEFT_DOWN
+    assert recording.events["delay"][3] == 300000  # 纳秒转为微秒
+    assert (recording.events["x"][2], recording.events["y"][2]) == (-5, 30)
+    assert recording.keys == ["a", "shift"]
+    assert recording.events["key"].tolist() == [-1, -1, -1, 0, 0, 1, 1, -1]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_saveLoadRoundTrip(tmp_path, mmap):
+    recording = CRecording.fromEvents(EVENTS)
+    path = str(tmp_path / "case.rec")
+    recording.save(path)
+    loaded = CRecording.load(path, mmap)
+    assertSameRecording(loaded, recording)
+    assert isinstance(loaded.events, np.memmap) == mmap
+
+
+def test_saveLoadEmpty(tmp_path):
+    path = str(tmp_path / "empty.rec")
+    CRecording.fromEvents([]).save(path)
+    assert len(CRecording.load(path)) == 0
+
+
+def test_loadRejectsUnknownFormat(tmp_path):
+    path = tmp_path / "bad.rec"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        CRecording.load(str(path))
+
+
+def test_csvRoundTrip(tmp_path):
+    # CSV中的间隔只精确到毫秒
+    recording = CRecording.fromEvents(EVENTS)
+    csv_path = str(tmp_path / "case.csv")
+    recording.toCsv(csv_path)
+    loaded = CRecording.fromCsv(csv_path)
+    assert loaded.keys == recording.keys
+    for field in ("event", "x", "y", "key"):
+        assert np.array_equal(loaded.events[field], recording.events[field])
+    assert np.array_equal(loaded.events["delay"], recording.events["delay"] // 1000 * 1000)
+
+
+def test_unnamedKeyStoredAsEmpty(tmp_path):
+    recording = CRecording.fromEvents([(0, "Keyboard", "key down", None), (0, "Keyboard", "key up", None)])
+    assert recording.keys == [""]
+    csv_path = str(tmp_path / "case.csv")
+    recording.toCsv(csv_path)
+    assert CRecording.fromCsv(csv_path).keys == [""]
+
+
+def test_loadRecordingWritesBinary(tmp_path):
+    csv_path = str(tmp_path / "case.csv")
+    CRecording.fromEvents(EVENTS).toCsv(csv_path)
+    first = loadRecording(csv_path)
+    assert (tmp_path / "case.rec").exists()
+    assertSameRecording(CRecording.load(recordingPath(csv_path), False), first)
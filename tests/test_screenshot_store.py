@@ -0,0 +1,77 @@
+import os
+import cv2
+import numpy as np
+import pytest
+from screenshot_store import CScreenshotStore, STORE_INDEX
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CScreenshotStore(str(tmp_path / "store"))
+
+
+def screenImage(value):
+    return np.full((20, 30, 3), value, dtype=np.uint8)
+
+
+def objectFiles(store):
+    names = []
+    for bucket in os.listdir(store.store_dir):
+        names.extend(os.listdir(os.path.join(store.store_dir, bucket)))
+    return names
+
+
+def test_sameImageStoredOnce(store, tmp_path):
+    first_dir, second_dir = tmp_path / "c1", tmp_path / "c2"
+    first_dir.mkdir()
+    second_dir.mkdir()
+    digest = store.put(str(first_dir / "2.png"), screenImage(10))
+    assert store.put(str(second_dir / "5.png"), screenImage(10)) == digest
+    assert objectFiles(store) == [digest + ".png"]
+    assert os.stat(store.objectPath(digest)).st_nlink == 3
+    assert np.array_equal(cv2.imread(str(second_dir / "5.png")), screenImage(10))
+
+
+def test_putReplacesExistingFile(store, tmp_path):
+    path = str(tmp_path / "2.png")
+    old_digest = store.put(path, screenImage(10))
+    new_digest = store.put(path, screenImage(20))
+    assert new_digest != old_digest
+    assert os.stat(store.objectPath(old_digest)).st_nlink == 1
+    assert np.array_equal(cv2.imread(path), screenImage(20))
+
+
+def test_flushWritesIndex(store, tmp_path):
+    digest = store.put(str(tmp_path / "2.png"), screenImage(10))
+    store.flush()
+    assert store.loadIndex(str(tmp_path)) == {"2.png": digest}
+    assert os.path.exists(str(tmp_path / STORE_INDEX))
+    assert not store.refs
+
+
+def test_releaseCollectsUnreferencedObjects(store, tmp_path):
+    first_dir, second_dir = tmp_path / "c1", tmp_path / "c2"
+    first_dir.mkdir()
+    second_dir.mkdir()
+    shared = store.put(str(first_dir / "2.png"), screenImage(10))
+    own = store.put(str(first_dir / "3.png"), screenImage(20))
+    store.put(str(second_dir / "2.png"), screenImage(10))
+    store.flush()
+    store.release(str(first_dir))
+    assert not first_dir.exists()
+    assert os.path.exists(store.objectPath(shared))
+    assert not os.path.exists(store.objectPath(own))
+
+
+def test_collect(store, tmp_path):
+    case_dir = tmp_path / "c1"
+    case_dir.mkdir()
+    kept = store.put(str(case_dir / "2.png"), screenImage(10))
+    orphan = store.put(str(case_dir / "3.png"), screenImage(20))
+    os.remove(str(case_dir / "3.png"))
+    temp_path = store.objectPath(kept) + ".1.1.tmp"
+    open(temp_path, 'wb').close()
+    assert store.collect() == 2
+    assert os.path.exists(store.objectPath(kept))
+    assert not os.path.exists(store.objectPath(orphan))
+    assert not os.path.exists(temp_path)